@@ -5,9 +5,14 @@ NAME
 DESCRIPTION
     This module implements Fenwick tree for prefix sum and prefix max.
 
-    * Fenwick     Fenwick tree for prefix sum query
-    * Fenwick2D   Fenwick tree for 2-dim prefix sum query
-    * FenwickMax  Fenwick tree for prefix max query
+    * Fenwick           Fenwick tree for prefix sum query
+    * FenwickNumpy      Fenwick tree backed by NumPy with batch add and query
+    * IndexedMultiset   multiset with rank/select on top of Fenwick tree
+    * FenwickRange      Fenwick tree for range increment and range sum query
+    * Fenwick2D         Fenwick tree for 2-dim prefix sum query
+    * FenwickOffline2D  Fenwick tree for 2-dim prefix sum over sparse points
+    * FenwickMonoid     Fenwick tree for prefix query over a commutative monoid
+    * FenwickMax        Fenwick tree for prefix max query
 
 CLASSES 
     class Fenwick(n)
@@ -15,11 +20,62 @@ CLASSES
      |
      |  Methods defined here: 
      |
+     |  from_array(arr)
+     |      build a Fenwick tree holding arr in O(n)
+     |
      |  add(k, delta) 
      |      add delta to the kth element 
      | 
      |  query(k)
      |      compure prefix sum of first k elements
+     |
+     |  lower_bound(target)
+     |      find first index where prefix sum reaches target
+     |
+     |  kth(k)
+     |      find index of kth unit when elements are counts
+
+    class FenwickNumpy(n)
+     |  Return a NumPy-backed Fenwick tree for prefix sum 
+     |
+     |  Methods defined here: 
+     |
+     |  add_many(idx, deltas) 
+     |      add deltas to the elements at idx in a batch
+     | 
+     |  query_many(idx)
+     |      compute prefix sums up to idx in a batch
+
+    class IndexedMultiset(universe)
+     |  Return a multiset with order statistics 
+     |
+     |  Methods defined here: 
+     |
+     |  insert(x) 
+     |      insert x 
+     |
+     |  erase(x) 
+     |      erase one copy of x 
+     | 
+     |  rank(x)
+     |      compute number of elements less than x
+     | 
+     |  select(k)
+     |      find kth smallest element
+
+    class FenwickRange(n)
+     |  Return a Fenwick tree for range increment and range sum 
+     |
+     |  Methods defined here: 
+     |
+     |  from_array(arr)
+     |      build a Fenwick tree holding arr in O(n)
+     |
+     |  range_add(lo, hi, delta) 
+     |      add delta to elements from lo to hi (exclusive)
+     | 
+     |  range_sum(lo, hi)
+     |      compute sum of elements from lo to hi (exclusive)
 
     class Fenwick2D(m, n)
      |  Return a Fenwick tree for 2-dim prefix sum 
@@ -32,8 +88,34 @@ CLASSES
      |  query(i, j)
      |      compure prefix sum of first i rows and j columns
 
-    class FenwickMax(n)
-     |  Return a Fenwick tree for prefix max
+    class FenwickOffline2D(points)
+     |  Return a Fenwick tree for 2-dim prefix sum over registered points 
+     |
+     |  Methods defined here: 
+     |
+     |  add(x, y, delta) 
+     |      add delta to the registered point (x, y)
+     | 
+     |  query(x, y)
+     |      compute sum over points with px <= x and py <= y
+
+    class FenwickMonoid(n, op, e, inv=None, typecode=None)
+     |  Return a Fenwick tree for prefix op (max, min, xor, gcd, ...)
+     |
+     |  Methods defined here: 
+     |
+     |  update(k, x)
+     |      combine x into kth element
+     |
+     |  query(k)
+     |      compute prefix op of first k elements
+     |
+     |  range_query(lo, hi)
+     |      compute op of elements from lo to hi (exclusive) for invertible op
+
+    class FenwickMax(n, typecode="q")
+     |  Return a Fenwick tree for prefix max (typecode=None for a list of 
+     |  arbitrary comparable values)
      |
      |  Methods defined here: 
      |
@@ -44,6 +126,16 @@ CLASSES
      |      compute prefix max of first k elements
 """
 
+from array import array
+from bisect import bisect_left, bisect_right
+from math import inf
+from typing import Any, Callable, List
+
+try: 
+    import numpy as np
+except ImportError: 
+    np = None
+
 class Fenwick: 
     """Fenwick tree for prefix sum query"""
 
@@ -51,6 +143,16 @@ class Fenwick:
         """Initialize a Fenwick tree."""
         self.nums = [0]*(n+1)
 
+    @classmethod 
+    def from_array(cls, arr: List[int]) -> "Fenwick": 
+        """Build a Fenwick tree holding arr in O(n)."""
+        ans = cls(0)
+        ans.nums = nums = [0] + list(arr)
+        for k in range(1, len(nums)): 
+            kk = k + (k & -k) # parent 
+            if kk < len(nums): nums[kk] += nums[k]
+        return ans 
+
     def add(self, k: int, delta: int) -> None: 
         """Update tree upon adding delta to kth element."""
         k += 1
@@ -67,6 +169,170 @@ class Fenwick:
             k -= k & -k 
         return ans
 
+    def lower_bound(self, target: int) -> int: 
+        """Return the smallest index whose prefix sum (inclusive) is no less than 
+        target (or n if none) by binary lifting; all elements must be non-negative."""
+        k = 0
+        step = 1 << (len(self.nums)-1).bit_length()
+        while step: 
+            if k + step < len(self.nums) and self.nums[k + step] < target: 
+                k += step 
+                target -= self.nums[k]
+            step >>= 1
+        return k 
+
+    def kth(self, k: int) -> int: 
+        """Return the index of the kth (0-indexed) unit when elements are counts."""
+        return self.lower_bound(k+1)
+
+
+class FenwickNumpy(Fenwick): 
+    """Fenwick tree for prefix sum query backed by a NumPy int64 array
+    Batches of updates and queries are processed together, moving every index 
+    of the batch one level per iteration (k += k & -k or k -= k & -k)."""
+
+    def __init__(self, n: int): 
+        """Initialize a Fenwick tree."""
+        if np is None: raise ImportError("FenwickNumpy requires numpy")
+        self.nums = np.zeros(n+1, dtype=np.int64)
+
+    @classmethod 
+    def from_array(cls, arr: List[int]) -> "FenwickNumpy": 
+        """Build a Fenwick tree holding arr in O(n) via prefix sums."""
+        ans = cls(len(arr))
+        prefix = np.zeros(len(arr)+1, dtype=np.int64)
+        np.cumsum(arr, out=prefix[1:])
+        k = np.arange(1, len(arr)+1)
+        ans.nums[1:] = prefix[k] - prefix[k - (k & -k)] # node k covers (k - lowbit(k), k]
+        return ans 
+
+    def add_many(self, idx: List[int], deltas: List[int]) -> None: 
+        """Update tree upon adding deltas[i] to idx[i]th element for all i."""
+        k = np.asarray(idx, dtype=np.int64) + 1
+        deltas = np.broadcast_to(np.asarray(deltas, dtype=np.int64), k.shape)
+        while k.size: 
+            np.add.at(self.nums, k, deltas) # repeated indices accumulate 
+            k = k + (k & -k)
+            mask = k < len(self.nums)
+            k, deltas = k[mask], deltas[mask]
+
+    def query_many(self, idx: List[int]) -> "np.ndarray": 
+        """Return the prefix sums up to idx[i]th index (inclusive) for all i."""
+        k = np.asarray(idx, dtype=np.int64) + 1
+        ans = np.zeros(k.shape, dtype=np.int64)
+        while k.any(): 
+            ans += self.nums[k] # nums[0] is always 0
+            k = k - (k & -k)
+        return ans 
+
+
+class IndexedMultiset: 
+    """Multiset over a known universe of values with order statistics 
+    Values are coordinate-compressed upfront and their counts kept in a Fenwick 
+    tree, so every operation takes O(log n)."""
+
+    def __init__(self, universe: List[int]): 
+        self.vals = sorted(set(universe))
+        self.index = {x: i for i, x in enumerate(self.vals)}
+        self.cnt = [0]*len(self.vals)
+        self.tree = Fenwick(len(self.vals))
+        self.size = 0
+
+    def __len__(self) -> int: 
+        return self.size 
+
+    def __contains__(self, x: int) -> bool: 
+        return self.count(x) > 0
+
+    def count(self, x: int) -> int: 
+        """Return the multiplicity of x."""
+        i = self.index.get(x)
+        return 0 if i is None else self.cnt[i]
+
+    def insert(self, x: int) -> None: 
+        """Insert x (which must be in the universe)."""
+        i = self.index[x]
+        self.cnt[i] += 1
+        self.tree.add(i, 1)
+        self.size += 1
+
+    def erase(self, x: int) -> bool: 
+        """Erase one copy of x and return True if x was present."""
+        i = self.index.get(x)
+        if i is None or not self.cnt[i]: return False 
+        self.cnt[i] -= 1
+        self.tree.add(i, -1)
+        self.size -= 1
+        return True 
+
+    def rank(self, x: int) -> int: 
+        """Return the number of elements less than x."""
+        return self.tree.query(bisect_left(self.vals, x)-1)
+
+    def select(self, k: int) -> int: 
+        """Return the kth (0-indexed) smallest element."""
+        if not 0 <= k < self.size: raise IndexError("select index out of range")
+        return self.vals[self.tree.kth(k)]
+
+
+class FenwickRange: 
+    """Fenwick tree for range increment and range sum query
+    Two trees b1, b2 hold the difference array d and i*d[i] so that the sum of 
+    the first k elements is k*prefix(b1, k) - prefix(b2, k)."""
+
+    def __init__(self, n: int): 
+        """Initialize a Fenwick tree."""
+        self.b1 = [0]*(n+1)
+        self.b2 = [0]*(n+1)
+
+    @classmethod 
+    def from_array(cls, arr: List[int]) -> "FenwickRange": 
+        """Build a Fenwick tree holding arr in O(n)."""
+        ans = cls(0)
+        ans.b1 = b1 = [0]*(len(arr)+1)
+        ans.b2 = b2 = [0]*(len(arr)+1)
+        prev = 0
+        for i, x in enumerate(arr): 
+            b1[i+1] = x - prev 
+            b2[i+1] = (x - prev) * i
+            prev = x
+        for k in range(1, len(b1)): 
+            kk = k + (k & -k) # parent 
+            if kk < len(b1): 
+                b1[kk] += b1[k]
+                b2[kk] += b2[k]
+        return ans 
+
+    def _add(self, k: int, delta: int) -> None: 
+        """Add delta to kth element of the difference array."""
+        b1, b2 = self.b1, self.b2
+        x = delta * k 
+        k += 1
+        while k < len(b1): 
+            b1[k] += delta 
+            b2[k] += x 
+            k += k & -k 
+
+    def _prefix(self, k: int) -> int: 
+        """Return the sum of the first k elements."""
+        b1, b2 = self.b1, self.b2
+        s1 = s2 = 0
+        i = k 
+        while i: 
+            s1 += b1[i]
+            s2 += b2[i]
+            i -= i & -i 
+        return s1 * k - s2 
+
+    def range_add(self, lo: int, hi: int, delta: int) -> None: 
+        """Update tree upon adding delta to elements from lo (inclusive) and hi (exclusive)."""
+        self._add(lo, delta)
+        self._add(hi, -delta)
+
+    def range_sum(self, lo: int, hi: int) -> int: 
+        """Return the sum of elements from lo (inclusive) and hi (exclusive)."""
+        return self._prefix(hi) - self._prefix(lo)
+
 
 class Fenwick2D: 
     """Fenwick tree for 2-dim prefix sum query"""
@@ -102,26 +368,100 @@ class Fenwick2D:
         return ans 
 
 
-class FenwickMax: 
-    """Fenwick tree for prefix max query. 
+class FenwickOffline2D: 
+    """Offline Fenwick tree for 2-dim prefix sum query over sparse points
+    All points that will ever be updated are registered upfront; row node i 
+    keeps only the sorted distinct columns of the points it covers (as a flat 
+    array) with a 1-dim Fenwick tree over them, so memory is O(n log n)."""
+
+    def __init__(self, points: List[List[int]]): 
+        """Initialize a 2-dim Fenwick tree over the given (x, y) points."""
+        self.xs = xs = sorted(set(x for x, _ in points))
+        index = {x: i for i, x in enumerate(xs)}
+        cols = [[] for _ in range(len(xs)+1)]
+        for x, y in points: 
+            i = index[x] + 1
+            while i <= len(xs): 
+                cols[i].append(y)
+                i += i & -i 
+        self.ys = [array("q", sorted(set(col))) for col in cols]
+        self.nums = [array("q", bytes(8*(len(ys)+1))) for ys in self.ys]
+
+    def add(self, x: int, y: int, delta: int) -> None: 
+        """Update tree upon adding delta to registered point (x, y)."""
+        i = bisect_left(self.xs, x) + 1
+        while i <= len(self.xs): 
+            ys, nums = self.ys[i], self.nums[i]
+            j = bisect_left(ys, y) + 1
+            while j <= len(ys): 
+                nums[j] += delta 
+                j += j & -j 
+            i += i & -i 
+
+    def query(self, x: int, y: int) -> int: 
+        """Return 2d prefix sum over points with px <= x and py <= y."""
+        ans = 0 
+        i = bisect_right(self.xs, x)
+        while i: 
+            ys, nums = self.ys[i], self.nums[i]
+            j = bisect_right(ys, y)
+            while j: 
+                ans += nums[j]
+                j -= j & -j 
+            i -= i & -i 
+        return ans 
+
+
+class FenwickMonoid: 
+    """Fenwick tree for prefix query over a commutative monoid (op, e)
+    e.g. max FenwickMonoid(n, max, -inf), xor FenwickMonoid(n, xor, 0, lambda x: x),
+    gcd FenwickMonoid(n, gcd, 0); with typecode (e.g. "q") values are kept in a 
+    compact array instead of a list, in which case e must fit the typecode 
+    (e.g. -(1 << 63) in place of -inf for max).
     Caveat: 
-    In order for Fenwick tree to work for max query, the updated value has to 
-    larger than the original value."""
-    def __init__(self, n: int): 
-        self.nums = [0]*(n+1)
-            
-    def update(self, k: int, x: int) -> None: 
-        """Update kth element with value x."""
+    For non-invertible op (max, min, gcd), update can only combine a new value 
+    into an element (e.g. raise it for max), not overwrite it."""
+
+    def __init__(self, n: int, op: Callable, e: Any, inv: Callable = None, typecode: str = None): 
+        """Initialize a Fenwick tree; inv maps a value to its inverse under op."""
+        self.op = op 
+        self.e = e 
+        self.inv = inv 
+        self.nums = array(typecode, [e])*(n+1) if typecode else [e]*(n+1)
+
+    def update(self, k: int, x: Any) -> None: 
+        """Update tree upon combining x into kth element."""
+        op, nums = self.op, self.nums
         k += 1
-        while k < len(self.data): 
-            self.nums[k] = max(self.nums[k], x)
+        while k < len(nums): 
+            nums[k] = op(nums[k], x)
             k += k & -k
 
-    def query(self, k: int) -> int: 
-        """Return prefix max up to kth index (inclusive)."""
+    def query(self, k: int) -> Any: 
+        """Return prefix value up to kth index (inclusive)."""
+        op, nums = self.op, self.nums
+        ans = self.e 
         k += 1
-        ans = 0 
         while k:
-            ans = max(ans, self.nums[k])
+            ans = op(ans, nums[k])
             k -= k & -k
         return ans 
+
+    def range_query(self, lo: int, hi: int) -> Any: 
+        """Return value from lo (inclusive) and hi (exclusive) by cancelling the 
+        prefix before lo (requires inv)."""
+        if self.inv is None: raise ValueError("range_query requires an invertible op (inv)")
+        return self.op(self.query(hi-1), self.inv(self.query(lo-1)))
+
+
+class FenwickMax(FenwickMonoid): 
+    """Fenwick tree for prefix max query. 
+    Caveat: 
+    In order for Fenwick tree to work for max query, the updated value has to 
+    larger than the original value."""
+    def __init__(self, n: int, typecode: str = "q"): 
+        """Initialize with the identity -inf, or the smallest value of typecode."""
+        if typecode is None or typecode in "fd": e = -inf 
+        elif typecode.isupper(): e = 0 # unsigned 
+        else: e = -(1 << 8*array(typecode).itemsize-1)
+        super().__init__(n, max, e, typecode=typecode)
@@ -12,12 +12,55 @@ DESCRIPTION
     * eulerian        check if Eulerian circuit/path exists
     * hierholzer      return a Eulerian circuit/path
     * dijkstra        return the shortest distance for a pair of nodes via Dijkstra's algo (all positive edges)
+    * dijkstra_sssp   return the shortest distances & predecessors from (multiple) sources via Dijkstra's algo
+    * PathQuery       answer many point-to-point queries via bidirectional Dijkstra or A* search
     * bellman_ford    return the shortest distnaces for a single source via Bellman-Ford algo (negative edges)
     * floyd_warshall  return the shortest distances for all pairs via Floyd-Warshall algo
     * kruskal         return a minimum spanning tree via Kruskal's algo
     * prim            return a minimum spanning tree via Prim's algo
 
+    Every algorithm accepts either adjacency lists or a CSRGraph (compressed 
+    sparse row storage in flat arrays: offsets, targets and optional weights).
+
+CLASSES
+    CSRGraph(offsets, targets, weights=None)
+     |  Return a graph in compressed sparse row format.
+     |
+     |  Methods defined here: 
+     |
+     |      from_edges(n, src, dst, weights=None, directed=True)
+     |
+     |      from_lists(graph)
+     |
+     |      from_file(path, n=None, directed=True, weighted=False)
+     |
+     |      load(path)
+     |
+     |      save(path)
+     |
+     |      close()
+     |
+     |      neighbors(u)
+     |
+     |      adj(u)
+     |
+     |      edges()
+     |
+     |      reverse()
+
+    PathQuery(graph, directed=True)
+     |  Return a reusable point-to-point shortest path engine.
+     |
+     |  Methods defined here: 
+     |
+     |      bidirectional(start, end)
+     |
+     |      astar(start, end, h)
+
 FUNCTIONS
+    edgelist_to_csr(src_path, dst_path, n=None, directed=True, weighted=False)
+        Convert a text edge list into the binary CSR format in bounded memory.
+
     tpsort(graph, indeg) 
         Topologically sort a digraph via Kahn's algo.
 
@@ -39,6 +82,15 @@ FUNCTIONS
     dijkstra(graph, start, end)
         Find shortest distance between start and end via Dijkstra's algo.
 
+    dijkstra_sssp(graph, sources, targets=None, queue="heap")
+        Find shortest distances and predecessors from sources via Dijkstra's algo.
+
+    reconstruct_path(pred, target)
+        Return the shortest path ending at target from predecessors.
+
+    euclidean(coords)
+        Return the straight-line distance heuristic h(u, v) for A*.
+
     bellman_ford(graph, start)
         Return the shortest distance from a single source
 
@@ -52,11 +104,266 @@ FUNCTIONS
         Return the minimum spanning tree.
 """
 
-def tpsort(graph: List[List[int]], indeg: List[int]) -> List[int]:
+import mmap
+import struct
+import sys
+from array import array
+from heapq import heapify, heappop, heappush
+from math import hypot, inf
+from numbers import Integral
+from typing import Any, Iterator, List, Tuple
+
+from priority_queue import IndexedHeap
+
+try: 
+    import numpy as np
+except ImportError: 
+    np = None
+
+
+class CSRGraph: 
+    """Graph in compressed sparse row format
+    The out-neighbors of u are targets[offsets[u]:offsets[u+1]] (with weights 
+    in the same slots), so the graph takes 4 bytes per edge plus the weight 
+    itemsize (12 for the default typecode "q") instead of a Python list per 
+    node and an int object per edge. graph[u] returns the 
+    neighbors like an adjacency list and graph.adj(u) the (v, w) pairs."""
+
+    def __init__(self, offsets: Any, targets: Any, weights: Any = None): 
+        self.offsets = offsets 
+        self.targets = targets 
+        self.weights = weights 
+        self.n = len(offsets)-1
+        self.mm = None # backing mmap of a loaded graph 
+
+    def __enter__(self) -> "CSRGraph": 
+        return self
+
+    def __exit__(self, *exc) -> None: 
+        self.close()
+
+    def close(self) -> None: 
+        """Release the views of a loaded graph and close its mmap (a no-op for 
+        in-memory graphs); raise BufferError while other exports (e.g. NumPy 
+        arrays over the sections) are still alive."""
+        if self.mm is None: return 
+        for buf in (self.offsets, self.targets, self.weights): 
+            if isinstance(buf, memoryview): buf.release()
+        self.mm.close()
+        self.mm = None 
+
+    def __len__(self) -> int: 
+        return self.n
+
+    def __getitem__(self, u: int) -> Any: 
+        return self.targets[self.offsets[u]:self.offsets[u+1]]
+
+    def neighbors(self, u: int) -> Any: 
+        """Return the out-neighbors of u."""
+        return self.targets[self.offsets[u]:self.offsets[u+1]]
+
+    def adj(self, u: int) -> Iterator[Tuple[int, Any]]: 
+        """Return the (neighbor, weight) pairs of u."""
+        lo, hi = self.offsets[u], self.offsets[u+1]
+        return zip(self.targets[lo:hi], self.weights[lo:hi] if self.weights is not None else [1]*(hi-lo))
+
+    def edges(self) -> Iterator[Tuple[int, int, Any]]: 
+        """Return all edges as (u, v, w) triples."""
+        for u in range(self.n): 
+            for v, w in self.adj(u): yield u, v, w
+
+    def reverse(self) -> "CSRGraph": 
+        """Return the graph with every edge reversed."""
+        src = array("i")
+        for u in range(self.n): src.extend([u] * (self.offsets[u+1] - self.offsets[u]))
+        typecode = _typecode(self.weights) if self.weights is not None else "q"
+        return CSRGraph.from_edges(self.n, self.targets, src, self.weights, typecode=typecode)
+
+    @classmethod 
+    def from_edges(cls, n: int, src: Any, dst: Any, weights: Any = None, directed: bool = True, typecode: str = "q") -> "CSRGraph": 
+        """Build a graph of n nodes from edge arrays, via a stable argsort in 
+        O(n + m log m) with NumPy or a counting sort in O(n + m) without it; 
+        undirected edges are stored in both directions."""
+        if np is not None: 
+            src, dst = np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64)
+            if not directed: # weights are read with mode="wrap" below instead of tiled 
+                src, dst = np.concatenate((src, dst), dtype=np.int32), np.concatenate((dst, src), dtype=np.int32)
+            order = np.argsort(src, kind="stable")
+            offsets = array("q", bytes(8*(n+1)))
+            np.cumsum(np.bincount(src, minlength=n), out=np.frombuffer(offsets, dtype=np.int64)[1:])
+            targets = array("i", bytes(4*len(order)))
+            np.take(dst, order, out=np.frombuffer(targets, dtype=np.int32), mode="clip")
+            if weights is not None: 
+                weights = np.asarray(weights)
+                if weights.size and not np.can_cast(weights.dtype, np.dtype(typecode), casting="same_kind"): 
+                    raise TypeError(f"{weights.dtype} weights do not fit typecode {typecode!r}")
+                weights = weights.astype(typecode, copy=False)
+                ws = array(typecode, bytes(array(typecode).itemsize*len(order)))
+                np.take(weights, order, out=np.frombuffer(ws, dtype=typecode), mode="wrap")
+                weights = ws 
+            return cls(offsets, targets, weights)
+        if not directed: 
+            src, dst = array("q", src) + array("q", dst), array("q", dst) + array("q", src)
+            if weights is not None: weights = array(typecode, weights) * 2
+        offsets = array("q", bytes(8*(n+1)))
+        for u in src: offsets[u+1] += 1
+        for u in range(n): offsets[u+1] += offsets[u]
+        pos = offsets[:-1]
+        targets = array("i", bytes(4*len(src)))
+        ws = array(typecode, bytes(array(typecode).itemsize*len(src))) if weights is not None else None
+        for i, (u, v) in enumerate(zip(src, dst)): 
+            targets[pos[u]] = v 
+            if ws is not None: ws[pos[u]] = weights[i]
+            pos[u] += 1
+        return cls(offsets, targets, ws)
+
+    @classmethod 
+    def from_lists(cls, graph: List[List[int]]) -> "CSRGraph": 
+        """Build a graph from adjacency lists."""
+        offsets = array("q", [0])
+        targets = array("i")
+        for nbrs in graph: 
+            targets.extend(nbrs)
+            offsets.append(len(targets))
+        return cls(offsets, targets)
+
+    @classmethod 
+    def from_file(cls, path: str, n: int = None, directed: bool = True, weighted: bool = False, typecode: str = "q") -> "CSRGraph": 
+        """Build a graph from a text file with one "u v [w]" edge per line 
+        (blank lines and lines starting with # are skipped)."""
+        src, dst = array("q"), array("q")
+        ws = array(typecode) if weighted else None
+        for u, v, w in _read_edges(path, weighted, typecode): 
+            src.append(u)
+            dst.append(v)
+            if weighted: ws.append(w)
+        if n is None: n = max(max(src, default=-1), max(dst, default=-1)) + 1
+        return cls.from_edges(n, src, dst, ws, directed, typecode)
+
+    def save(self, path: str) -> None: 
+        """Write the graph to path in the binary CSR format."""
+        n, m = self.n, len(self.targets)
+        typecode = _typecode(self.weights) if self.weights is not None else "\0"
+        with open(path, "wb") as f: 
+            f.write(_HEADER.pack(_MAGIC, _VERSION, n, m, typecode.encode()))
+            f.write(_raw(self.offsets, "q"))
+            f.write(_raw(self.targets, "i"))
+            f.write(bytes(-4*m % 8))
+            if self.weights is not None: f.write(_raw(self.weights, typecode))
+
+    @classmethod 
+    def load(cls, path: str) -> "CSRGraph": 
+        """Open a graph in the binary CSR format via mmap without copying; the 
+        sections are memoryviews over the mapped file, which stays open until 
+        close() (or the end of a with block)."""
+        with open(path, "rb") as f: 
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try: 
+            with memoryview(mm) as buf: 
+                magic, version, n, m, typecode = _HEADER.unpack_from(buf)
+                if magic != _MAGIC or version != _VERSION: raise ValueError(f"{path} is not a CSR graph file")
+                if sys.byteorder != "little": raise ValueError("CSR graph files are little endian")
+                typecode = typecode.decode()
+                offsets, targets, weights = _sections(n, m, typecode)
+                graph = cls(buf[slice(*offsets)].cast("q"), 
+                            buf[slice(*targets)].cast("i"), 
+                            buf[slice(*weights)].cast(typecode) if typecode != "\0" else None)
+        except BaseException: 
+            mm.close()
+            raise 
+        graph.mm = mm 
+        return graph 
+
+
+"""
+BINARY CSR FORMAT (little endian, every section starts at a multiple of 8)
+    header    magic b"CSRG", version (u32), n (u64), m (u64), weight typecode 
+              (1 byte, b"\0" if unweighted), 7 bytes padding
+    offsets   (n+1) int64
+    targets   m int32, zero-padded to a multiple of 8 bytes
+    weights   m values of the weight typecode (absent if unweighted)
+"""
+
+_MAGIC = b"CSRG"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIQQc7x")
+
+
+def _typecode(buf: Any) -> str: 
+    """Return the typecode of an array or memoryview."""
+    return buf.typecode if isinstance(buf, array) else buf.format
+
+
+def _raw(buf: Any, typecode: str) -> memoryview: 
+    """Return the bytes of buf stored as the given typecode."""
+    if _typecode(buf) != typecode: buf = array(typecode, buf)
+    return memoryview(buf).cast("B")
+
+
+def _sections(n: int, m: int, typecode: str) -> List[Tuple[int, int]]: 
+    """Return the byte ranges of offsets, targets and weights."""
+    lo = _HEADER.size
+    offsets = (lo, lo + 8*(n+1))
+    targets = (offsets[1], offsets[1] + 4*m)
+    lo = targets[1] + (-4*m % 8)
+    weights = (lo, lo + (array(typecode).itemsize*m if typecode != "\0" else 0))
+    return [offsets, targets, weights]
+
+
+def _read_edges(path: str, weighted: bool = False, typecode: str = "q") -> Iterator[Tuple[int, int, Any]]: 
+    """Stream (u, v, w) from a text file with one "u v [w]" edge per line 
+    (blank lines and lines starting with # are skipped)."""
+    conv = float if typecode in "fd" else int 
+    with open(path) as f: 
+        for line in f: 
+            parts = line.split()
+            if not parts or parts[0].startswith("#"): continue 
+            yield int(parts[0]), int(parts[1]), conv(parts[2]) if weighted else 1
+
+
+def edgelist_to_csr(src_path: str, dst_path: str, n: int = None, directed: bool = True, weighted: bool = False, typecode: str = "q") -> None: 
+    """Convert a text edge list into the binary CSR format in two streaming 
+    passes (count degrees, then scatter edges into the mapped output file), 
+    so memory is O(n) regardless of the number of edges."""
+    degree = array("q", bytes(8*(n or 0)))
+    m = 0
+    for u, v, _ in _read_edges(src_path, weighted, typecode): 
+        for a, b in ((u, v), (v, u)) if not directed else ((u, v),): 
+            if max(a, b) >= len(degree): degree.frombytes(bytes(8*(max(a, b)+1-len(degree))))
+            degree[a] += 1
+            m += 1
+    n = len(degree)
+    offsets = array("q", [0])*(n+1)
+    for u in range(n): offsets[u+1] = offsets[u] + degree[u]
+    del degree 
+    if not weighted: typecode = "\0"
+    sections = _sections(n, m, typecode)
+    with open(dst_path, "w+b") as f: 
+        f.write(_HEADER.pack(_MAGIC, _VERSION, n, m, typecode.encode()))
+        f.write(memoryview(offsets).cast("B"))
+        f.truncate(sections[2][1])
+        with mmap.mmap(f.fileno(), sections[2][1]) as mm: 
+            buf = memoryview(mm)
+            targets = buf[slice(*sections[1])].cast("i")
+            weights = buf[slice(*sections[2])].cast(typecode) if weighted else None
+            pos = offsets[:-1]
+            for u, v, w in _read_edges(src_path, weighted, typecode): 
+                for a, b in ((u, v), (v, u)) if not directed else ((u, v),): 
+                    targets[pos[a]] = b 
+                    if weighted: weights[pos[a]] = w
+                    pos[a] += 1
+            del targets, weights, buf
+
+
+def tpsort(graph: List[List[int]], indeg: List[int] = None) -> List[int]:
     """Kahn's algo
     Return a topological order of the digraph."""
+    if indeg is None: 
+        indeg = [0]*len(graph)
+        for u in range(len(graph)): 
+            for v in graph[u]: indeg[v] += 1
     ans = []
-    stack = [u for u in graph if indeg[u] == 0]
+    stack = [u for u in range(len(graph)) if indeg[u] == 0]
     while stack: 
         u = stack.pop()
         ans.append(u)
@@ -75,7 +382,7 @@ def tpsort3(graph: List[List[int]]) -> List[int]:
     def dfs(u):
         """Return True if a cycle is detected."""
         visited[u] = -1 # mark GRAY
-        for v in digraph[u]:
+        for v in graph[u]:
             if visited[v] == -1 or not visited[v] and dfs(v): return True 
         ans.append(u)
         visited[u] = 1 # mark BLACK
@@ -165,15 +472,15 @@ def eulerian(graph: List[List[int]]) -> bool:
 def eulerian(digraph: List[List[int]]) -> int: 
     """Return start node if digraph has a Eulerian circuit/path."""
     degree = [0]*len(digraph) # net out degree
-    for u in digraph: 
+    for u in range(len(digraph)): 
         degree[u] += len(digraph[u])
         for v in digraph[u]: degree[v] -= 1
     pos = neg = start = 0 
-    for x in degree: 
+    for u, x in enumerate(degree): 
         if abs(x) > 1: return -1 # no Eulerian path 
         if x == 1: 
             pos += 1
-            start = x
+            start = u
         elif x == -1: neg += 1
     if not (pos == neg == 0 or pos == neg == 1): return -1 # no Eulerian path 
     return start 
@@ -186,11 +493,16 @@ def hierholzer(graph: List[List[int]]) -> List[int]:
     start = eulerian(graph)
     if start > -1: 
         # iterative implementation of Hierholzer's algo
-        stack = []
+        if not isinstance(graph, CSRGraph): graph = CSRGraph.from_lists(graph)
+        targets = graph.targets
+        ptr = array("q", graph.offsets) # next unused edge of every node 
+        stack = [start]
         while stack: 
-            while digraph[stack[-1]]: 
-                stack.append(digraph[stack[-1]].pop())
-            ans.append(stack.pop())
+            u = stack[-1]
+            if ptr[u] < graph.offsets[u+1]: 
+                stack.append(targets[ptr[u]])
+                ptr[u] += 1
+            else: ans.append(stack.pop())
         ans.reverse()
         """
         # recursive implementation of Hierholzer's algo
@@ -205,17 +517,181 @@ def hierholzer(graph: List[List[int]]) -> List[int]:
 def dijkstra(graph: List[List[List[int]]], start: int, end: int) -> int: 
     """Dijkstra's algo 
     Return the shortest distance between start and end."""
-    pq = [(0, start)]
-    dist = [inf] * n 
-    dist[start] = 0 
-    while pq: 
-        d, u = heappop(pq)
-        if u == end: return d
-        for v, w in graph[u]: 
-            if dist[u] + w < dist[v]: 
-                dist[v] = dist[u] + w 
-                heappush(pq, (dist[v], v))
-    return -1 
+    dist, _ = dijkstra_sssp(graph, start, [end])
+    return dist[end] if dist[end] < inf else -1 
+
+
+def dijkstra_sssp(graph: List[List[List[int]]], sources: Any, targets: List[int] = None, queue: str = "heap") -> Tuple[List[Any], List[int]]: 
+    """Dijkstra's algo 
+    Return the shortest distances from sources (a node or a list of nodes) and 
+    the predecessor of every node on its shortest path (-1 for sources and 
+    unreachable nodes). With targets, stop as soon as every target is settled, 
+    in which case only settled nodes have final distances. queue is "heap" 
+    (binary heap skipping stale entries), "indexed" (d-ary heap with 
+    decrease-key holding at most one entry per node) or "dial" (Dial's bucket 
+    queue for small non-negative integer weights)."""
+    if queue not in ("heap", "indexed", "dial"): raise ValueError(f"unknown queue {queue!r}; expected 'heap', 'indexed' or 'dial'")
+    adj = graph.adj if isinstance(graph, CSRGraph) else graph.__getitem__
+    dist = [inf] * len(graph)
+    pred = [-1] * len(graph)
+    sources = [sources] if isinstance(sources, Integral) else sources
+    remaining = set(targets) if targets is not None else None 
+    for s in sources: dist[s] = 0
+    if queue == "dial": 
+        if isinstance(graph, CSRGraph): cap = max(graph.weights, default=0) if graph.weights is not None else 1
+        else: cap = max((w for u in range(len(graph)) for _, w in graph[u]), default=0)
+        buckets = [[] for _ in range(cap+1)] # circular: bucket d % (cap+1) holds distance d 
+        buckets[0].extend(sources)
+        size, d = len(sources), 0
+        while size: 
+            bucket = buckets[d % (cap+1)]
+            if not bucket: 
+                d += 1
+                continue 
+            u = bucket.pop()
+            size -= 1
+            if dist[u] != d: continue # stale entry 
+            if remaining is not None: 
+                remaining.discard(u)
+                if not remaining: break 
+            for v, w in adj(u): 
+                if d + w < dist[v]: 
+                    dist[v] = d + w 
+                    pred[v] = u
+                    buckets[(d + w) % (cap+1)].append(v)
+                    size += 1
+    elif queue == "indexed": 
+        pq = IndexedHeap(len(graph))
+        for s in sources: pq.update(s, 0)
+        while pq: 
+            u, d = pq.pop()
+            if remaining is not None: 
+                remaining.discard(u)
+                if not remaining: break 
+            for v, w in adj(u): 
+                if d + w < dist[v]: 
+                    dist[v] = d + w 
+                    pred[v] = u
+                    pq.update(v, d + w)
+    else: 
+        pq = [(0, s) for s in sources]
+        heapify(pq)
+        while pq: 
+            d, u = heappop(pq)
+            if d > dist[u]: continue # stale entry 
+            if remaining is not None: 
+                remaining.discard(u)
+                if not remaining: break 
+            for v, w in adj(u): 
+                if d + w < dist[v]: 
+                    dist[v] = d + w 
+                    pred[v] = u
+                    heappush(pq, (d + w, v))
+    return dist, pred 
+
+
+def reconstruct_path(pred: List[int], target: int) -> List[int]: 
+    """Return the path ending at target by following predecessors."""
+    ans = []
+    while target != -1: 
+        ans.append(target)
+        target = pred[target]
+    ans.reverse()
+    return ans 
+
+
+class PathQuery: 
+    """Point-to-point shortest path engine
+    The dist/pred arrays of both search directions are allocated once and 
+    reused across queries; an entry is valid only if its stamp equals the 
+    version of the current query, so starting a query costs O(1) instead of 
+    an O(V) reset. Both searches return (distance, path), with (inf, []) if 
+    end is unreachable."""
+
+    def __init__(self, graph: List[List[List[int]]], directed: bool = True): 
+        self.graph = graph 
+        if not directed: self.rgraph = graph 
+        elif isinstance(graph, CSRGraph): self.rgraph = graph.reverse()
+        else: 
+            self.rgraph = [[] for _ in range(len(graph))]
+            for u in range(len(graph)): 
+                for v, w in graph[u]: self.rgraph[v].append([u, w])
+        n = len(graph)
+        self.adj = [g.adj if isinstance(g, CSRGraph) else g.__getitem__ for g in (graph, self.rgraph)]
+        self.dist = [[inf] * n, [inf] * n]            # forward & backward 
+        self.pred = [array("i", [-1]) * n, array("i", [-1]) * n]
+        self.stamp = [array("q", [0]) * n, array("q", [0]) * n]
+        self.version = 0 
+
+    def _path(self, meet: int) -> List[int]: 
+        """Return the path through meet from the preds of the current query."""
+        ans = []
+        for side in (0, 1): 
+            pred, stamp, half = self.pred[side], self.stamp[side], []
+            u = pred[meet] if side else meet 
+            while u != -1 and stamp[u] == self.version: 
+                half.append(u)
+                u = pred[u]
+            if side: ans.extend(half)
+            else: ans = half[::-1]
+        return ans 
+
+    def bidirectional(self, start: int, end: int) -> Tuple[Any, List[int]]: 
+        """Bidirectional Dijkstra's algo 
+        Grow the smaller of the two frontiers and stop once the frontier keys 
+        sum to at least the best meeting distance mu."""
+        self.version += 1
+        ver = self.version 
+        for side, s in enumerate((start, end)): 
+            self.dist[side][s] = 0
+            self.pred[side][s] = -1
+            self.stamp[side][s] = ver 
+        pqs = [[(0, start)], [(0, end)]]
+        mu, meet = (0, start) if start == end else (inf, -1)
+        while pqs[0] and pqs[1] and pqs[0][0][0] + pqs[1][0][0] < mu: 
+            side = 0 if len(pqs[0]) <= len(pqs[1]) else 1
+            dist, pred, stamp = self.dist[side], self.pred[side], self.stamp[side]
+            odist, ostamp = self.dist[1-side], self.stamp[1-side]
+            d, u = heappop(pqs[side])
+            if d > dist[u]: continue # stale entry 
+            for v, w in self.adj[side](u): 
+                if stamp[v] != ver or d + w < dist[v]: 
+                    dist[v] = d + w 
+                    pred[v] = u 
+                    stamp[v] = ver 
+                    heappush(pqs[side], (d + w, v))
+                    if ostamp[v] == ver and d + w + odist[v] < mu: mu, meet = d + w + odist[v], v
+        return (mu, self._path(meet)) if meet != -1 else (inf, [])
+
+    def astar(self, start: int, end: int, h: Any) -> Tuple[Any, List[int]]: 
+        """A* search 
+        Expand nodes by dist + h(u, end), where h is an admissible estimate of 
+        the remaining distance (a node is reopened if a shorter path shows up, 
+        so h need not be consistent)."""
+        self.version += 1
+        ver = self.version 
+        dist, pred, stamp, adj = self.dist[0], self.pred[0], self.stamp[0], self.adj[0]
+        dist[start], pred[start], stamp[start] = 0, -1, ver 
+        pq = [(h(start, end), 0, start)]
+        while pq: 
+            _, d, u = heappop(pq)
+            if d > dist[u]: continue # stale entry 
+            if u == end: return d, self._path(end)
+            for v, w in adj(u): 
+                if stamp[v] != ver or d + w < dist[v]: 
+                    dist[v] = d + w 
+                    pred[v] = u 
+                    stamp[v] = ver 
+                    heappush(pq, (d + w + h(v, end), d + w, v))
+        return inf, []
+
+
+def euclidean(coords: List[Tuple[float, float]]) -> Any: 
+    """Return the heuristic h(u, v) = straight-line distance between the 
+    coordinates of u and v, admissible if no edge is shorter than that."""
+    def h(u, v): 
+        return hypot(coords[u][0] - coords[v][0], coords[u][1] - coords[v][1])
+    return h 
 
 
 def bellman_ford(n, edges: List[List[int]], start): 
@@ -224,7 +700,7 @@ def bellman_ford(n, edges: List[List[int]], start):
     dist = [inf] * n
     dist[start] = 0 
     for i in range(n-1): 
-        for u, v, w in edges: 
+        for u, v, w in (edges.edges() if isinstance(edges, CSRGraph) else edges): 
             if dist[u] + w < dist[v]: dist[v] = dist[u] + w
     return dist 
 
@@ -234,7 +710,7 @@ def floyd_warshall(n, edges: List[List[int]]):
     Return the short distances of every pair of nodes."""
     dist = [[inf]*n for _ in range(n)] # adjacency matrix 
     for u in range(n): dist[u][u] = 0 
-    for u, v, w in edges: dist[u][v] = w 
+    for u, v, w in (edges.edges() if isinstance(edges, CSRGraph) else edges): dist[u][v] = w 
     for k in range(n): 
         for u in range(n): 
             for v in range(n): 
@@ -251,22 +727,41 @@ def kruskal(n, edges: List[List[int]]):
         if p != parent[p]: parent[p] = find(parent[p])
         return parent[p]
 
-    pq = [(w, u, v) for u, v, w in edges]
+    pq = [(w, u, v) for u, v, w in (edges.edges() if isinstance(edges, CSRGraph) else edges)]
     heapify(pq)
     ans = []
     while pq: 
         w, u, v = heappop(pq)
         uu, vv = find(u), find(v)
         if uu != vv: 
-        ans.append((u, v))
-        parent[uu] = parent[vv]
+            ans.append((u, v))
+            parent[uu] = parent[vv]
     return ans 
 
 
-def prim():
+def prim(graph: List[List[List[int]]]) -> List[Tuple[int, int]]:
     """Prim's algo
-    Return the minimum spanning tree."""
-    pass 
+    Return the minimum spanning tree (forest) of a weighted undirected graph 
+    as a list of edges. Every node outside the tree sits in an indexed heap 
+    at most once, keyed by its lightest edge into the tree."""
+    adj = graph.adj if isinstance(graph, CSRGraph) else graph.__getitem__
+    n = len(graph)
+    seen = [False] * n 
+    pred = [-1] * n 
+    pq = IndexedHeap(n)
+    ans = []
+    for s in range(n): 
+        if seen[s]: continue 
+        pq.push(s, 0)
+        while pq: 
+            u, _ = pq.pop()
+            seen[u] = True 
+            if pred[u] != -1: ans.append((pred[u], u))
+            for v, w in adj(u): 
+                if not seen[v] and (v not in pq or w < pq.prio[v]): 
+                    pred[v] = u 
+                    pq.update(v, w)
+    return ans 
 
 
 """
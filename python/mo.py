@@ -0,0 +1,105 @@
+"""
+NAME
+    mo - Mo's algorithm for offline range queries
+
+DESCRIPTION
+    This module implements Mo's algorithm which answers offline range queries
+    (distinct count, mode frequency, ...) by sliding a window [cl, cr) over the
+    array, provided the answer can be maintained upon adding/removing a single
+    element.
+
+    * mo            Mo's algorithm with queries sorted in Hilbert-curve order
+    * mo_updates    Mo's algorithm with point updates (time as 3rd dimension)
+
+FUNCTIONS
+    hilbert(x, y, bits)
+        Return the position of (x, y) along a Hilbert curve of 2^bits side.
+
+    mo(queries, add, remove, get)
+        Return answers of queries [lo, hi) in the original order.
+
+    mo_updates(arr, queries, updates, add, remove, get)
+        Return answers of queries [lo, hi) at time t in the original order.
+"""
+
+from typing import Any, Callable, List, Tuple
+
+
+def hilbert(x: int, y: int, bits: int) -> int:
+    """Return the position of (x, y) along a Hilbert curve of 2^bits side."""
+    ans = 0
+    s = 1 << bits-1
+    while s:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        ans += s * s * (3*rx ^ ry)
+        if not ry:
+            if rx: x, y = ~x, ~y # only the lower bits matter from here on
+            x, y = y, x
+        s >>= 1
+    return ans
+
+
+def mo(queries: List[Tuple[int, int]], add: Callable, remove: Callable, get: Callable) -> List[Any]:
+    """Mo's algo
+    Return answers of queries [lo, hi) in the original order, where add(i) and
+    remove(i) insert/delete the ith element into/from the window and get()
+    returns the answer of the current window."""
+    if not queries: return []
+    bits = max(1, max(hi for _, hi in queries).bit_length())
+    keys = [hilbert(lo, hi, bits) for lo, hi in queries]
+    ans = [None] * len(queries)
+    cl = cr = 0
+    for qi in sorted(range(len(queries)), key=keys.__getitem__):
+        lo, hi = queries[qi]
+        # grow before shrinking so that the window is never inverted
+        for i in range(cl-1, lo-1, -1): add(i)
+        for i in range(cr, hi): add(i)
+        for i in range(cl, lo): remove(i)
+        for i in range(cr-1, hi-1, -1): remove(i)
+        cl, cr = lo, hi
+        ans[qi] = get()
+    return ans
+
+
+def mo_updates(arr: List[Any], queries: List[Tuple[int, int, int]], updates: List[Tuple[int, Any]],
+               add: Callable, remove: Callable, get: Callable) -> List[Any]:
+    """Mo's algo with updates
+    Return answers of queries (lo, hi, t) over [lo, hi) after the first t point
+    updates (pos, val) have been applied to arr. add(i) and remove(i) read arr[i],
+    which is updated in place while sweeping and restored before returning."""
+    if not queries: return []
+    block = max(1, round(len(arr) ** (2/3)))
+
+    def key(qi):
+        lo, hi, t = queries[qi]
+        bl, br = lo // block, hi // block
+        return bl, br if bl & 1 == 0 else -br, t if br & 1 == 0 else -t
+
+    vals = [val for _, val in updates]
+    ans = [None] * len(queries)
+    cl = cr = ct = 0
+
+    def toggle(j):
+        """Swap arr[pos] with the value of update j (apply or undo it)."""
+        pos = updates[j][0]
+        if cl <= pos < cr:
+            remove(pos)
+            arr[pos], vals[j] = vals[j], arr[pos]
+            add(pos)
+        else: arr[pos], vals[j] = vals[j], arr[pos]
+
+    for qi in sorted(range(len(queries)), key=key):
+        lo, hi, t = queries[qi]
+        for i in range(cl-1, lo-1, -1): add(i)
+        for i in range(cr, hi): add(i)
+        for i in range(cl, lo): remove(i)
+        for i in range(cr-1, hi-1, -1): remove(i)
+        cl, cr = lo, hi
+        for j in range(ct, t): toggle(j)
+        for j in range(ct-1, t-1, -1): toggle(j)
+        ct = t
+        ans[qi] = get()
+    cl = cr = 0
+    for j in range(ct-1, -1, -1): toggle(j)
+    return ans
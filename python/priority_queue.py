@@ -0,0 +1,128 @@
+"""
+NAME
+    priority_queue - indexed priority queue
+
+DESCRIPTION
+    This module implements an indexed d-ary min-heap over keys 0..n-1 (e.g.
+    graph nodes). Besides the heap array it keeps the position of every key,
+    so a key is stored at most once and its priority can be changed in place
+    instead of pushing duplicates.
+
+    * IndexedHeap  indexed d-ary heap with decrease-key
+
+CLASSES
+    IndexedHeap(n, d=4)
+     |  Return an indexed d-ary min-heap over keys 0..n-1.
+     |
+     |  Methods defined here:
+     |
+     |      push(key, prio)
+     |
+     |      pop()
+     |
+     |      peek()
+     |
+     |      decrease_key(key, prio)
+     |
+     |      update(key, prio)
+     |
+     |      contains(key)
+"""
+
+from array import array
+from math import inf
+from typing import Any, Tuple
+
+
+class IndexedHeap:
+    """Indexed d-ary min-heap
+    heap holds keys in heap order, pos[key] is the index of key in heap (-1 if
+    absent) and prio[key] its priority; a wider node (d = 4) makes the heap
+    shallower, which pays off when decrease_key dominates as in Dijkstra."""
+
+    def __init__(self, n: int, d: int = 4):
+        self.d = d
+        self.heap = array("i")
+        self.pos = array("i", [-1]) * n
+        self.prio = [inf] * n
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, key: int) -> bool:
+        return self.pos[key] >= 0
+
+    def contains(self, key: int) -> bool:
+        """Return True if key is in the heap."""
+        return self.pos[key] >= 0
+
+    def _sift_up(self, i: int) -> None:
+        """Move the key at i up until its parent is no larger."""
+        heap, pos, prio, d = self.heap, self.pos, self.prio, self.d
+        key = heap[i]
+        p = prio[key]
+        while i:
+            parent = (i-1) // d
+            if prio[heap[parent]] <= p: break
+            heap[i] = heap[parent]
+            pos[heap[i]] = i
+            i = parent
+        heap[i] = key
+        pos[key] = i
+
+    def _sift_down(self, i: int) -> None:
+        """Move the key at i down until its children are no smaller."""
+        heap, pos, prio, d = self.heap, self.pos, self.prio, self.d
+        key = heap[i]
+        p = prio[key]
+        n = len(heap)
+        while True:
+            lo = d*i + 1
+            if lo >= n: break
+            child, cp = lo, prio[heap[lo]]
+            for c in range(lo+1, min(lo+d, n)):
+                if prio[heap[c]] < cp: child, cp = c, prio[heap[c]]
+            if cp >= p: break
+            heap[i] = heap[child]
+            pos[heap[i]] = i
+            i = child
+        heap[i] = key
+        pos[key] = i
+
+    def push(self, key: int, prio: Any) -> None:
+        """Insert key with priority prio (key must not be in the heap)."""
+        if self.pos[key] >= 0: raise KeyError(f"{key} is already in the heap")
+        self.prio[key] = prio
+        self.heap.append(key)
+        self._sift_up(len(self.heap)-1)
+
+    def peek(self) -> Tuple[int, Any]:
+        """Return the (key, prio) pair with the smallest priority."""
+        key = self.heap[0]
+        return key, self.prio[key]
+
+    def pop(self) -> Tuple[int, Any]:
+        """Remove and return the (key, prio) pair with the smallest priority."""
+        heap = self.heap
+        key = heap[0]
+        last = heap.pop()
+        self.pos[key] = -1
+        if heap:
+            heap[0] = last
+            self._sift_down(0)
+        return key, self.prio[key]
+
+    def decrease_key(self, key: int, prio: Any) -> None:
+        """Lower the priority of key (which must be in the heap) to prio."""
+        if self.pos[key] < 0: raise KeyError(f"{key} is not in the heap")
+        if prio > self.prio[key]: raise ValueError(f"new priority {prio} is larger than {self.prio[key]}")
+        self.prio[key] = prio
+        self._sift_up(self.pos[key])
+
+    def update(self, key: int, prio: Any) -> None:
+        """Insert key or change its priority in either direction."""
+        i = self.pos[key]
+        if i < 0: return self.push(key, prio)
+        old, self.prio[key] = self.prio[key], prio
+        if prio < old: self._sift_up(i)
+        else: self._sift_down(i)
@@ -6,172 +6,731 @@ NAME
 DESCRIPTION
     This module implements segment tree data structure. 
 
-    * SegTree      segment tree
-    * SegTreeLazy  segment tree with lazy propagation
+    * SegTree            segment tree over a monoid (min, max, sum, gcd, ...)
+    * LazySegTree        segment tree with lazy propagation of range actions 
+                         (add, assign, affine, ...)
+    * SegTreeBeats       segment tree beats for range chmin/chmax/add
+    * PersistentSegTree  segment tree keeping every version via path copying
+    * RangeKth           range kth smallest via persistent segment tree
+    * DynamicSegTree     segment tree allocating nodes on demand over huge ranges
+    * SegTreeIter        iterative segment tree for range sum query
+    * SegTreeIterNumpy   SegTreeIter backed by NumPy with vectorized bulk build 
+                         and batch point update
 
 CLASSES
-    SegTree(arr)
+    SegTree(arr, op=min, e=inf)
      |  Return a segment tree.
      |  
      |  Methods defined here: 
      |
-     |      update(idx, val, k, lo, hi)
+     |      get(i)
      |
-     |      query(qlo, qhi, k, lo, hi)
+     |      set(i, val)
+     |
+     |      update(i, delta)
+     |
+     |      query(lo, hi)
+     |
+     |      max_right(lo, pred)
+     |
+     |      min_left(hi, pred)
+     |
+     |      first_true(lo, pred)
      |      
 
-    SegTreeLazy(arr)
+    LazySegTree(arr, op, e, mapping, composition, id_)
      |  Return a segment tree with lazy propagation
      | 
      |  Methods defined here: 
      |
-     |      update(idx, val, k, lo, hi)
+     |      get(i)
+     |
+     |      set(i, val)
+     |
+     |      update(lo, hi, f)
+     |
+     |      query(lo, hi)
+     |
+     |      max_right(lo, pred)
+     |
+     |      min_left(hi, pred)
+     |
+     |      first_true(lo, pred)
+
+    SegTreeBeats(arr)
+     |  Return a segment tree beats
+     | 
+     |  Methods defined here: 
+     |
+     |      add(lo, hi, x)
+     |
+     |      chmin(lo, hi, x)
+     |
+     |      chmax(lo, hi, x)
+     |
+     |      query_sum(lo, hi)
+     |
+     |      query_max(lo, hi)
      |
-     |      query(qlo, qhi, k, lo, hi)
+     |      query_min(lo, hi)
+
+    PersistentSegTree(arr, updates=0)
+     |  Return a persistent segment tree for range sum query
+     | 
+     |  Methods defined here: 
+     |
+     |      update(ver, i, delta)
+     |
+     |      query(ver, lo, hi)
+     |
+     |      kth(vlo, vhi, k)
+
+    RangeKth(arr)
+     |  Return a structure for range kth smallest query
+     | 
+     |  Methods defined here: 
+     |
+     |      query(lo, hi, k)
+
+    DynamicSegTree(lo, hi, lazy=False)
+     |  Return a dynamically allocated segment tree for range sum query
+     | 
+     |  Methods defined here: 
+     |
+     |      update(i, delta)
+     |
+     |      range_update(qlo, qhi, delta)
+     |
+     |      query(qlo, qhi)
+
+    SegTreeIterNumpy(arr, dtype="int64")
+     |  Return a NumPy-backed segment tree for range sum query
+     | 
+     |  Methods defined here: 
+     |
+     |      update(i, delta)
+     |
+     |      update_many(indices, deltas)
+     |
+     |      query(lo, hi)
 """
 
+from array import array
+from math import inf
+from operator import add
+from typing import Any, Callable, List
+
+try: 
+    import numpy as np
+except ImportError: 
+    np = None
+
 class SegTree: 
+    """Iterative segment tree over a monoid (op, e)
+    Reference: https://codeforces.com/blog/entry/18051
 
-    def __init__(self, arr: List[int]): 
-        """Build the setmentation tree."""
-        self.n = n = len(arr)
-        self.tree = [0]*(4*n)
-        self._build(arr, 0, 0, n)
+    op is an associative binary function and e its identity, e.g. 
+        min  SegTree(arr)               max  SegTree(arr, max, -inf)
+        sum  SegTree(arr, add, 0)       gcd  SegTree(arr, gcd, 0)
+    Leaves are padded with e up to a power of two so that every node covers an 
+    aligned range; the tree is a flat list where node k has children 2k, 2k+1."""
 
-    def _build(self, arr: List[int], k: int, lo: int, hi: int) -> None: 
-        """Build segment tree from array."""
-        if lo+1 == hi: self.tree[k] = arr[lo]
-        else: 
-            mid = lo + hi >> 1
-            self._build(arr, 2*k+1, lo, mid)
-            self._build(arr, 2*k+2, mid, hi)
-            self.tree[k] = min(self.tree[2*k+1], self.tree[2*k+2])
+    def __init__(self, arr: List[int], op: Callable = min, e: Any = inf): 
+        """Build the segment tree bottom-up in O(n)."""
+        self.n = n = len(arr)
+        self.op = op 
+        self.e = e 
+        self.size = size = 1 << max(0, n-1).bit_length()
+        self.tree = tree = [e] * (2*size)
+        tree[size:size+n] = arr
+        for k in range(size-1, 0, -1): tree[k] = op(tree[2*k], tree[2*k+1])
+
+    def get(self, i: int) -> Any: 
+        """Return the value at i."""
+        return self.tree[i + self.size]
+
+    def set(self, i: int, val: Any) -> None: 
+        """Point assignment update the value at i to val."""
+        op, tree = self.op, self.tree
+        i += self.size
+        tree[i] = val
+        while i > 1: 
+            i >>= 1
+            tree[i] = op(tree[2*i], tree[2*i+1])
 
-    def update(self, i: int, delta: int, k: int = 0, lo: int = 0, hi: int = 0) -> None:
+    def update(self, i: int, delta: int) -> None:
         """Update segment tree when array value at i is incresed by delta."""
-        if not hi: hi = self.n
-        if lo+1 == hi: self.tree[k] += delta # leaf node
-        else: 
-            mid = lo + hi >> 1
-            if i < mid: self.update(i, delta, 2*k+1, lo, mid) 
-            else: self.update(i, delta, 2*k+2, mid, hi)
-            self.tree[k] = min(self.tree[2*k+1], self.tree[2*k+2])
+        self.set(i, self.tree[i + self.size] + delta)
+
+    def query(self, lo: int, hi: int) -> Any: 
+        """Query value from lo (inclusive) and hi (exclusive)."""
+        op, tree = self.op, self.tree
+        left = right = self.e # left & right accumulators keep op order 
+        lo += self.size
+        hi += self.size
+        while lo < hi: 
+            if lo & 1: 
+                left = op(left, tree[lo])
+                lo += 1
+            if hi & 1: 
+                hi -= 1
+                right = op(tree[hi], right)
+            lo >>= 1
+            hi >>= 1
+        return op(left, right)
+
+    def max_right(self, lo: int, pred: Callable) -> int: 
+        """Return the largest hi such that pred(query(lo, hi)) is true via one 
+        descent of the tree (pred must be monotone with pred(e) true)."""
+        if lo == self.n: return self.n 
+        op, tree, size = self.op, self.tree, self.size
+        lo += size
+        acc = self.e
+        while True: 
+            while not lo & 1: lo >>= 1
+            if not pred(op(acc, tree[lo])): 
+                while lo < size: 
+                    lo <<= 1
+                    if pred(op(acc, tree[lo])): 
+                        acc = op(acc, tree[lo])
+                        lo += 1
+                return lo - size
+            acc = op(acc, tree[lo])
+            lo += 1
+            if lo & -lo == lo: return self.n 
+
+    def min_left(self, hi: int, pred: Callable) -> int: 
+        """Return the smallest lo such that pred(query(lo, hi)) is true via one 
+        descent of the tree (pred must be monotone with pred(e) true)."""
+        if hi == 0: return 0 
+        op, tree, size = self.op, self.tree, self.size
+        hi += size
+        acc = self.e
+        while True: 
+            hi -= 1
+            while hi > 1 and hi & 1: hi >>= 1
+            if not pred(op(tree[hi], acc)): 
+                while hi < size: 
+                    hi = 2*hi+1
+                    if pred(op(tree[hi], acc)): 
+                        acc = op(tree[hi], acc)
+                        hi -= 1
+                return hi + 1 - size
+            acc = op(tree[hi], acc)
+            if hi & -hi == hi: return 0 
+
+    def first_true(self, lo: int, pred: Callable) -> int: 
+        """Return the first index i >= lo where pred(query(lo, i+1)) is true, 
+        or n if there is none (e.g. first prefix sum exceeding k, or first value 
+        less than x in a min tree)."""
+        return self.max_right(lo, lambda x: not pred(x))
+
+
+class LazySegTree: 
+    """Iterative segment tree with lazy propagation
+    Reference: https://atcoder.github.io/ac-library/production/document_en/lazysegtree.html
+
+    Values form a monoid (op, e) and range updates are actions f applied via 
+    mapping(f, x, width) where width is the number of leaves under the node; 
+    composition(f, g) returns the action "g then f" and id_ is the no-op, e.g.
+        add    mapping=lambda f, x, w: x + f*w (sum) or x + f (min/max)
+               composition=add, id_=0
+        assign mapping=lambda f, x, w: x if f is None else f*w (sum) or f 
+               composition=lambda f, g: g if f is None else f, id_=None
+        affine mapping=lambda f, x, w: f[0]*x + f[1]*w (sum)
+               composition=lambda f, g: (f[0]*g[0], f[0]*g[1] + f[1]), id_=(1, 0)"""
+
+    def __init__(self, arr: List[int], op: Callable, e: Any, mapping: Callable, composition: Callable, id_: Any): 
+        """Build the segment tree bottom-up in O(n)."""
+        self.n = n = len(arr)
+        self.op = op 
+        self.e = e 
+        self.mapping = mapping 
+        self.composition = composition 
+        self.id_ = id_
+        self.log = log = max(0, n-1).bit_length()
+        self.size = size = 1 << log
+        self.tree = tree = [e] * (2*size)
+        self.lazy = [id_] * size
+        tree[size:size+n] = arr
+        for k in range(size-1, 0, -1): tree[k] = op(tree[2*k], tree[2*k+1])
+
+    def _apply(self, k: int, f: Any) -> None: 
+        """Apply action f to node k and defer it to its children."""
+        self.tree[k] = self.mapping(f, self.tree[k], self.size >> k.bit_length()-1)
+        if k < self.size: self.lazy[k] = self.composition(f, self.lazy[k])
+
+    def _push(self, k: int) -> None: 
+        """Propagate pending action of node k to its children."""
+        f = self.lazy[k]
+        if f != self.id_: 
+            self._apply(2*k, f)
+            self._apply(2*k+1, f)
+            self.lazy[k] = self.id_
+
+    def _push_path(self, lo: int, hi: int) -> None: 
+        """Push pending actions on the paths from root to leaves lo and hi-1."""
+        for s in range(self.log, 0, -1): 
+            if (lo >> s) << s != lo: self._push(lo >> s)
+            if (hi >> s) << s != hi: self._push(hi-1 >> s)
+
+    def get(self, i: int) -> Any: 
+        """Return the value at i."""
+        i += self.size
+        for s in range(self.log, 0, -1): self._push(i >> s)
+        return self.tree[i]
+
+    def set(self, i: int, val: Any) -> None: 
+        """Point assignment update the value at i to val."""
+        op, tree = self.op, self.tree
+        i += self.size
+        for s in range(self.log, 0, -1): self._push(i >> s)
+        tree[i] = val
+        while i > 1: 
+            i >>= 1
+            tree[i] = op(tree[2*i], tree[2*i+1])
+
+    def query(self, lo: int, hi: int) -> Any: 
+        """Query value from lo (inclusive) and hi (exclusive)."""
+        if lo >= hi: return self.e
+        op, tree = self.op, self.tree
+        lo += self.size
+        hi += self.size
+        self._push_path(lo, hi)
+        left = right = self.e
+        while lo < hi: 
+            if lo & 1: 
+                left = op(left, tree[lo])
+                lo += 1
+            if hi & 1: 
+                hi -= 1
+                right = op(tree[hi], right)
+            lo >>= 1
+            hi >>= 1
+        return op(left, right)
+
+    def update(self, lo: int, hi: int, f: Any) -> None: 
+        """Apply action f to every value from lo (inclusive) and hi (exclusive)."""
+        if lo >= hi: return 
+        op, tree = self.op, self.tree
+        lo += self.size
+        hi += self.size
+        self._push_path(lo, hi)
+        ll, hh = lo, hi
+        while lo < hi: 
+            if lo & 1: 
+                self._apply(lo, f)
+                lo += 1
+            if hi & 1: 
+                hi -= 1
+                self._apply(hi, f)
+            lo >>= 1
+            hi >>= 1
+        for s in range(1, self.log+1): 
+            if (ll >> s) << s != ll: 
+                k = ll >> s
+                tree[k] = op(tree[2*k], tree[2*k+1])
+            if (hh >> s) << s != hh: 
+                k = hh-1 >> s
+                tree[k] = op(tree[2*k], tree[2*k+1])
+
+    def max_right(self, lo: int, pred: Callable) -> int: 
+        """Return the largest hi such that pred(query(lo, hi)) is true via one 
+        descent of the tree (pred must be monotone with pred(e) true)."""
+        if lo == self.n: return self.n 
+        op, tree, size = self.op, self.tree, self.size
+        lo += size
+        for s in range(self.log, 0, -1): self._push(lo >> s)
+        acc = self.e
+        while True: 
+            while not lo & 1: lo >>= 1
+            if not pred(op(acc, tree[lo])): 
+                while lo < size: 
+                    self._push(lo)
+                    lo <<= 1
+                    if pred(op(acc, tree[lo])): 
+                        acc = op(acc, tree[lo])
+                        lo += 1
+                return lo - size
+            acc = op(acc, tree[lo])
+            lo += 1
+            if lo & -lo == lo: return self.n 
+
+    def min_left(self, hi: int, pred: Callable) -> int: 
+        """Return the smallest lo such that pred(query(lo, hi)) is true via one 
+        descent of the tree (pred must be monotone with pred(e) true)."""
+        if hi == 0: return 0 
+        op, tree, size = self.op, self.tree, self.size
+        hi += size
+        for s in range(self.log, 0, -1): self._push(hi-1 >> s)
+        acc = self.e
+        while True: 
+            hi -= 1
+            while hi > 1 and hi & 1: hi >>= 1
+            if not pred(op(tree[hi], acc)): 
+                while hi < size: 
+                    self._push(hi)
+                    hi = 2*hi+1
+                    if pred(op(tree[hi], acc)): 
+                        acc = op(tree[hi], acc)
+                        hi -= 1
+                return hi + 1 - size
+            acc = op(tree[hi], acc)
+            if hi & -hi == hi: return 0 
+
+    def first_true(self, lo: int, pred: Callable) -> int: 
+        """Return the first index i >= lo where pred(query(lo, i+1)) is true, 
+        or n if there is none (e.g. first prefix sum exceeding k, or first value 
+        less than x in a min tree)."""
+        return self.max_right(lo, lambda x: not pred(x))
+
+
+class LazySegTreeMin(LazySegTree):
+    """Lazy segment tree for range increment and range min query"""
+    
+    def __init__(self, arr: List[int]): 
+        """Build the segmentation tree."""
+        super().__init__(arr, min, inf, lambda f, x, w: x + f, add, 0)
 
-    def query(self, qlo: int, qhi: int, k: int = 0, lo: int = 0, hi: int = 0) -> int: 
-        """Query value from qlo (inclusive) and qhi (exclusive)."""
-        if not hi: hi = self.n
-        if qhi <= lo or  hi <= qlo: return inf          #      no overlap 
-        if qlo <= lo and hi <= qhi: return self.tree[k] #   total overlap 
-        mid = lo + hi >> 1                              # partial overlap 
-        return min(self.query(qlo, qhi, 2*k+1, lo, mid), self.query(qlo, qhi, 2*k+2, mid, hi))
 
+class LazySegTreeSum(LazySegTree):
+    """Lazy segment tree for range increment and range sum query"""
+
+    def __init__(self, arr: List[int]):
+        """Build the segmentation tree."""
+        super().__init__(arr, add, 0, lambda f, x, w: x + f*w, add, 0)
+
+
+class LazySegTreeIter(LazySegTree):
+    """Lazy segment tree for range increment and range max query"""
 
-class LazySegTreeMin:
-    
     def __init__(self, arr: List[int]): 
         """Build the segmentation tree."""
-        self.n = n = len(arr)
-        self.lazy = [0]*(4*n)
-        self.tree = [0]*(4*n)
-        self._build(arr, 0, 0, n)
+        super().__init__(arr, max, -inf, lambda f, x, w: x + f, add, 0)
 
-    def _build(self, arr: List[int], k: int, lo: int, hi: int) -> None: 
-        """Build segment tree from array."""
-        if lo+1 == hi: self.tree[k] = arr[lo]
-        else: 
-            mid = lo + hi >> 1
-            self._build(arr, 2*k+1, lo, mid)
-            self._build(arr, 2*k+2, mid, hi)
-            self.tree[k] = min(self.tree[2*k+1], self.tree[2*k+2]) 
 
-    def update(self, qlo: int, qhi: int, delta: int, k: int = 0, lo: int = 0, hi: int = 0) -> None:
-        """Update segment tree when value in [qlo, qhi) is incresed by delta."""
-        if not hi: hi = self.n
+class SegTreeBeats: 
+    """Segment tree beats for range chmin/chmax/add and range sum/max/min query
+    Reference: https://codeforces.com/blog/entry/57319
+
+    Same layout as LazySegTree (leaves padded to a power of two, node k has 
+    children 2k, 2k+1) with one flat list per field; updates walk the tree with 
+    an explicit stack instead of recursion. Amortized O(log^2 n) per update."""
+
+    def __init__(self, arr: List[int]): 
+        self.n = n = len(arr)
+        self.log = log = max(0, n-1).bit_length()
+        self.size = size = 1 << log
+        self.mx1 = [-inf] * (2*size) # largest value 
+        self.mx2 = [-inf] * (2*size) # strictly second largest value 
+        self.mxc = [0] * (2*size)    # count of largest value 
+        self.mn1 = [inf] * (2*size)  # smallest value 
+        self.mn2 = [inf] * (2*size)  # strictly second smallest value 
+        self.mnc = [0] * (2*size)    # count of smallest value 
+        self.sm = [0] * (2*size)     # sum 
+        self.width = [0] * (2*size)  # number of (non-padding) leaves 
+        self.lazy = [0] * size       # pending increment 
+        for i, x in enumerate(arr): 
+            k = i + size
+            self.mx1[k] = self.mn1[k] = self.sm[k] = x
+            self.mxc[k] = self.mnc[k] = self.width[k] = 1
+        for k in range(size-1, 0, -1): 
+            self.width[k] = self.width[2*k] + self.width[2*k+1]
+            self._pull(k)
+
+    def _pull(self, k: int) -> None: 
+        """Recompute node k from its children."""
+        mx1, mx2, mxc, mn1, mn2, mnc = self.mx1, self.mx2, self.mxc, self.mn1, self.mn2, self.mnc
+        l, r = 2*k, 2*k+1
+        self.sm[k] = self.sm[l] + self.sm[r]
+        if mx1[l] > mx1[r]: 
+            mx1[k], mxc[k], mx2[k] = mx1[l], mxc[l], max(mx2[l], mx1[r])
+        elif mx1[l] < mx1[r]: 
+            mx1[k], mxc[k], mx2[k] = mx1[r], mxc[r], max(mx1[l], mx2[r])
+        else: 
+            mx1[k], mxc[k], mx2[k] = mx1[l], mxc[l] + mxc[r], max(mx2[l], mx2[r])
+        if mn1[l] < mn1[r]: 
+            mn1[k], mnc[k], mn2[k] = mn1[l], mnc[l], min(mn2[l], mn1[r])
+        elif mn1[l] > mn1[r]: 
+            mn1[k], mnc[k], mn2[k] = mn1[r], mnc[r], min(mn1[l], mn2[r])
+        else: 
+            mn1[k], mnc[k], mn2[k] = mn1[l], mnc[l] + mnc[r], min(mn2[l], mn2[r])
+
+    def _add(self, k: int, x: int) -> None: 
+        """Increment every value under node k by x."""
+        self.sm[k] += x * self.width[k]
+        self.mx1[k] += x 
+        self.mx2[k] += x 
+        self.mn1[k] += x 
+        self.mn2[k] += x 
+        if k < self.size: self.lazy[k] += x
+
+    def _chmin(self, k: int, x: int) -> None: 
+        """Cap values under node k at x (requires mx2[k] < x < mx1[k])."""
+        mx1 = self.mx1[k]
+        self.sm[k] += (x - mx1) * self.mxc[k]
+        if self.mn1[k] == mx1: self.mn1[k] = x 
+        if self.mn2[k] == mx1: self.mn2[k] = x 
+        self.mx1[k] = x 
+
+    def _chmax(self, k: int, x: int) -> None: 
+        """Raise values under node k to x (requires mn1[k] < x < mn2[k])."""
+        mn1 = self.mn1[k]
+        self.sm[k] += (x - mn1) * self.mnc[k]
+        if self.mx1[k] == mn1: self.mx1[k] = x 
+        if self.mx2[k] == mn1: self.mx2[k] = x 
+        self.mn1[k] = x 
+
+    def _push(self, k: int) -> None: 
+        """Propagate pending increment and caps of node k to its children."""
         if self.lazy[k]: 
-            self.tree[k] += self.lazy[k]
-            if lo+1 < hi: # non-leaf 
-                self.lazy[2*k+1] += self.lazy[k] # mark children for lazy propagation
-                self.lazy[2*k+2] += self.lazy[k] # mark children for lazy propagation
+            self._add(2*k, self.lazy[k])
+            self._add(2*k+1, self.lazy[k])
             self.lazy[k] = 0
-        if lo < hi and qlo < hi and lo < qhi: 
-            if qlo <= lo and hi <= qhi: # total overlap
-                self.tree[k] += delta
-                if lo+1 < hi: 
-                    self.lazy[2*k+1] += delta 
-                    self.lazy[2*k+2] += delta 
+        for c in 2*k, 2*k+1: 
+            if self.mx1[c] > self.mx1[k]: self._chmin(c, self.mx1[k])
+            if self.mn1[c] < self.mn1[k]: self._chmax(c, self.mn1[k])
+
+    def _update(self, qlo: int, qhi: int, x: int, op: int) -> None: 
+        """Apply op (0 add, 1 chmin, 2 chmax) with x from qlo (inclusive) and qhi (exclusive)."""
+        mx1, mx2, mn1, mn2 = self.mx1, self.mx2, self.mn1, self.mn2
+        stack = [(1, 0, self.size)]
+        while stack: 
+            k, lo, hi = stack.pop()
+            if k < 0: self._pull(~k)
+            elif qhi <= lo or hi <= qlo: continue 
+            elif op == 1 and mx1[k] <= x or op == 2 and mn1[k] >= x: continue # break condition 
+            elif qlo <= lo and hi <= qhi and (op == 0 or op == 1 and mx2[k] < x or op == 2 and mn2[k] > x): # tag condition 
+                if op == 0: self._add(k, x)
+                elif op == 1: self._chmin(k, x)
+                else: self._chmax(k, x)
             else: 
+                self._push(k)
                 mid = lo + hi >> 1
-                self.update(qlo, qhi, delta, 2*k+1, lo, mid) 
-                self.update(qlo, qhi, delta, 2*k+2, mid, hi)
-                self.tree[k] = min(self.tree[2*k+1], self.tree[2*k+2])
+                stack.append((~k, lo, hi))
+                stack.append((2*k, lo, mid))
+                stack.append((2*k+1, mid, hi))
+
+    def add(self, lo: int, hi: int, x: int) -> None: 
+        """Range increment values from lo (inclusive) and hi (exclusive) by x."""
+        self._update(lo, hi, x, 0)
+
+    def chmin(self, lo: int, hi: int, x: int) -> None: 
+        """Range update a[i] = min(a[i], x) from lo (inclusive) and hi (exclusive)."""
+        self._update(lo, hi, x, 1)
+
+    def chmax(self, lo: int, hi: int, x: int) -> None: 
+        """Range update a[i] = max(a[i], x) from lo (inclusive) and hi (exclusive)."""
+        self._update(lo, hi, x, 2)
+
+    def _query(self, lo: int, hi: int, tree: List[int], op: Callable, e: int) -> int: 
+        """Push boundary paths then combine nodes covering [lo, hi) bottom-up."""
+        lo += self.size
+        hi += self.size
+        for s in range(self.log, 0, -1): 
+            if (lo >> s) << s != lo: self._push(lo >> s)
+            if (hi >> s) << s != hi: self._push(hi-1 >> s)
+        ans = e 
+        while lo < hi: 
+            if lo & 1: 
+                ans = op(ans, tree[lo])
+                lo += 1
+            if hi & 1: 
+                hi -= 1
+                ans = op(ans, tree[hi])
+            lo >>= 1
+            hi >>= 1
+        return ans 
 
-    def query(self, qlo: int, qhi: int, k: int = 0, lo: int = 0, hi: int = 0) -> int: 
-        """Query value from qlo (inclusive) and qhi (exclusive)."""
-        if not hi: hi = self.n
-        if self.lazy[k]: 
-            self.tree[k] += self.lazy[k]
-            if lo+1 < hi: 
-                self.lazy[2*k+1] += self.lazy[k]
-                self.lazy[2*k+2] += self.lazy[k]
-            self.lazy[k] = 0 
-        if qhi <= lo or  hi <= qlo: return inf          #      no overlap 
-        if qlo <= lo and hi <= qhi: return self.tree[k] #   total overlap 
-        mid = lo + hi >> 1                              # partial overlap 
-        return min(self.query(qlo, qhi, 2*k+1, lo, mid), self.query(qlo, qhi, 2*k+2, mid, hi))
+    def query_sum(self, lo: int, hi: int) -> int: 
+        """Query sum from lo (inclusive) and hi (exclusive)."""
+        return self._query(lo, hi, self.sm, add, 0)
 
+    def query_max(self, lo: int, hi: int) -> int: 
+        """Query max from lo (inclusive) and hi (exclusive)."""
+        return self._query(lo, hi, self.mx1, max, -inf)
 
-class LazySegTreeSum:
+    def query_min(self, lo: int, hi: int) -> int: 
+        """Query min from lo (inclusive) and hi (exclusive)."""
+        return self._query(lo, hi, self.mn1, min, inf)
 
-    def __init__(self, arr: List[int]):
-        """Build the segmentation tree."""
+
+class PersistentSegTree: 
+    """Persistent segment tree via path copying
+    Every point update creates a new version sharing all untouched nodes with 
+    the previous one. Nodes live in parallel arrays (left, right, tree) and node 
+    0 is the null node (an all-zero subtree pointing to itself)."""
+
+    def __init__(self, arr: List[int], updates: int = 0): 
+        """Build version 0 from arr, reserving room for the given number of updates."""
         self.n = n = len(arr)
-        self.tree = [0]*(4*n)
-        self.lazy = [0]*(4*n)
-        self._build(arr, 0, 0, n)
-
-    def _build(self, arr: List[int], k: int, lo: int, hi: int) -> None:
-        """Build segment tree from array."""
-        if lo+1 == hi: self.tree[k] = arr[lo]
-        else:
+        cap = 2*n + updates*(n.bit_length()+1) + 1
+        self.left = array('q', bytes(8*cap))
+        self.right = array('q', bytes(8*cap))
+        self.tree = array('q', bytes(8*cap))
+        self.cnt = 1 
+        self.roots = [self._build(arr, 0, n)]
+
+    def _new(self, left: int, right: int, val: int) -> int: 
+        """Return a new node from the pool, doubling the pool if it is full."""
+        if self.cnt == len(self.tree): 
+            for pool in self.left, self.right, self.tree: pool.frombytes(bytes(8*len(pool)))
+        k = self.cnt
+        self.left[k] = left 
+        self.right[k] = right 
+        self.tree[k] = val 
+        self.cnt += 1
+        return k 
+
+    def _build(self, arr: List[int], lo: int, hi: int) -> int: 
+        """Build subtree of arr[lo:hi]; all-zero ranges share the null node."""
+        if lo >= hi: return 0
+        if lo+1 == hi: return self._new(0, 0, arr[lo]) if arr[lo] else 0 
+        mid = lo + hi >> 1
+        left, right = self._build(arr, lo, mid), self._build(arr, mid, hi)
+        if not left and not right: return 0 
+        return self._new(left, right, self.tree[left] + self.tree[right])
+
+    def update(self, ver: int, i: int, delta: int) -> int: 
+        """Increment the value at i by delta on top of version ver and return 
+        the new version."""
+        left, right, tree = self.left, self.right, self.tree
+        path = []
+        k, lo, hi = self.roots[ver], 0, self.n
+        while lo+1 < hi: 
             mid = lo + hi >> 1
-            self._build(arr, 2*k+1, lo, mid)
-            self._build(arr, 2*k+2, mid, hi)
-            self.tree[k] = self.tree[2*k+1] + self.tree[2*k+2]
-
-    def update(self, qlo: int, qhi: int, delta: int, k: int = 0, lo: int = 0, hi: int = 0) -> None:
-        """Update segment tree when value in [qlo, qhi) is incresed by delta."""
-        if not hi: hi = self.n
-        if self.lazy[k]:
-            self.tree[k] += (hi-lo)*self.lazy[k]
-            if lo+1 < hi: # non-leaf
-                self.lazy[2*k+1] += self.lazy[k] # mark children for lazy propagation
-                self.lazy[2*k+2] += self.lazy[k] # mark children for lazy propagation
-            self.lazy[k] = 0
-        if lo < hi and qlo < hi and lo < qhi:
-            if qlo <= lo and hi <= qhi: # total overlap
-                self.tree[k] += (hi-lo)*delta
-                if lo+1 < hi:
-                    self.lazy[2*k+1] += delta
-                    self.lazy[2*k+2] += delta
-            else:
+            path.append((k, i >= mid))
+            if i < mid: k, hi = left[k], mid
+            else: k, lo = right[k], mid
+        node = self._new(0, 0, tree[k] + delta)
+        for k, go_right in reversed(path): 
+            if go_right: node = self._new(left[k], node, tree[left[k]] + tree[node])
+            else: node = self._new(node, right[k], tree[node] + tree[right[k]])
+        self.roots.append(node)
+        return len(self.roots)-1
+
+    def query(self, ver: int, lo: int, hi: int) -> int: 
+        """Query sum from lo (inclusive) and hi (exclusive) as of version ver."""
+        left, right, tree = self.left, self.right, self.tree
+        ans = 0 
+        stack = [(self.roots[ver], 0, self.n)]
+        while stack: 
+            k, l, r = stack.pop()
+            if not k or hi <= l or r <= lo: continue        #      no overlap 
+            if lo <= l and r <= hi: ans += tree[k]          #   total overlap 
+            else:                                           # partial overlap 
+                mid = l + r >> 1
+                stack.append((left[k], l, mid))
+                stack.append((right[k], mid, r))
+        return ans 
+
+    def kth(self, vlo: int, vhi: int, k: int) -> int: 
+        """Return the index holding the kth (0-indexed) unit of the difference 
+        between versions vhi and vlo, i.e. the kth smallest value when versions 
+        count values inserted one at a time."""
+        left, right, tree = self.left, self.right, self.tree
+        a, b = self.roots[vlo], self.roots[vhi]
+        lo, hi = 0, self.n
+        while lo+1 < hi: 
+            mid = lo + hi >> 1
+            cnt = tree[left[b]] - tree[left[a]]
+            if k < cnt: a, b, hi = left[a], left[b], mid
+            else: 
+                k -= cnt 
+                a, b, lo = right[a], right[b], mid
+        return lo 
+
+
+class RangeKth: 
+    """Range kth smallest query via persistent segment tree 
+    Version i counts the values of arr[:i] over their sorted distinct values."""
+
+    def __init__(self, arr: List[int]): 
+        self.vals = vals = sorted(set(arr))
+        rank = {x: i for i, x in enumerate(vals)}
+        self.tree = PersistentSegTree([0]*len(vals), len(arr))
+        for i, x in enumerate(arr): self.tree.update(i, rank[x], 1)
+
+    def query(self, lo: int, hi: int, k: int) -> int: 
+        """Return the kth (0-indexed) smallest of arr[lo:hi]."""
+        return self.vals[self.tree.kth(lo, hi, k)]
+
+
+class DynamicSegTree: 
+    """Dynamic segment tree for sum query over coordinates [lo, hi)
+    Nodes are created only along touched paths and live in a growable pool of 
+    flat arrays (node 0 is the null node). With lazy=True, range increments are 
+    kept as non-propagated tags so that no node is ever created by a push."""
+
+    def __init__(self, lo: int, hi: int, lazy: bool = False): 
+        self.lo = lo
+        self.hi = hi
+        self.left = array('q', [0, 0])
+        self.right = array('q', [0, 0])
+        self.tree = [0, 0]
+        self.tag = [0, 0] if lazy else None 
+
+    def _new(self) -> int: 
+        """Return a new empty node from the pool."""
+        self.left.append(0)
+        self.right.append(0)
+        self.tree.append(0)
+        if self.tag is not None: self.tag.append(0)
+        return len(self.tree)-1
+
+    def update(self, i: int, delta: int) -> None: 
+        """Point increment update the value at i by delta."""
+        left, right, tree = self.left, self.right, self.tree
+        k, lo, hi = 1, self.lo, self.hi
+        while True: 
+            tree[k] += delta 
+            if lo+1 == hi: break 
+            mid = lo + hi >> 1
+            if i < mid: 
+                if not left[k]: left[k] = self._new()
+                k, hi = left[k], mid
+            else: 
+                if not right[k]: right[k] = self._new()
+                k, lo = right[k], mid
+
+    def range_update(self, qlo: int, qhi: int, delta: int) -> None: 
+        """Range increment update values from qlo (inclusive) and qhi (exclusive) 
+        by delta (requires lazy=True)."""
+        if self.tag is None: raise ValueError("range_update requires lazy=True")
+        left, right, tree, tag = self.left, self.right, self.tree, self.tag
+        stack = [(1, self.lo, self.hi)]
+        while stack: 
+            k, lo, hi = stack.pop()
+            if qhi <= lo or hi <= qlo: continue 
+            if qlo <= lo and hi <= qhi: 
+                tag[k] += delta 
+                tree[k] += delta*(hi-lo)
+            else: 
+                tree[k] += delta*(min(hi, qhi) - max(lo, qlo))
                 mid = lo + hi >> 1
-                self.update(qlo, qhi, delta, 2*k+1, lo, mid)
-                self.update(qlo, qhi, delta, 2*k+2, mid, hi)
-                self.tree[k] = self.tree[2*k+1] + self.tree[2*k+2]
-
-    def query(self, qlo: int, qhi: int, k: int = 0, lo: int = 0, hi: int = 0) -> int:
-        """Query value from qlo (inclusive) and qhi (exclusive)."""
-        if not hi: hi = self.n
-        if self.lazy[k]:
-            self.tree[k] += (hi-lo)*self.lazy[k]
-            if lo+1 < hi:
-                self.lazy[2*k+1] += self.lazy[k]
-                self.lazy[2*k+2] += self.lazy[k]
-            self.lazy[k] = 0
-        if qhi <= lo or  hi <= qlo: return 0            #      no overlap
-        if qlo <= lo and hi <= qhi: return self.tree[k] #   total overlap
-        mid = lo + hi >> 1                              # partial overlap
-        return self.query(qlo, qhi, 2*k+1, lo, mid) + self.query(qlo, qhi, 2*k+2, mid, hi)
+                if qlo < mid: 
+                    if not left[k]: left[k] = self._new()
+                    stack.append((left[k], lo, mid))
+                if mid < qhi: 
+                    if not right[k]: right[k] = self._new()
+                    stack.append((right[k], mid, hi))
+
+    def query(self, qlo: int, qhi: int) -> int: 
+        """Query sum from qlo (inclusive) and qhi (exclusive)."""
+        left, right, tree, tag = self.left, self.right, self.tree, self.tag
+        ans = 0
+        stack = [(1, self.lo, self.hi, 0)] # acc is the sum of ancestors' tags 
+        while stack: 
+            k, lo, hi, acc = stack.pop()
+            if qhi <= lo or hi <= qlo: continue 
+            if not k: ans += acc*(min(hi, qhi) - max(lo, qlo))
+            elif qlo <= lo and hi <= qhi: ans += tree[k] + acc*(hi-lo)
+            else: 
+                if tag is not None: acc += tag[k]
+                mid = lo + hi >> 1
+                stack.append((left[k], lo, mid, acc))
+                stack.append((right[k], mid, hi, acc))
+        return ans 
 
 
 class SegTreeIter: 
@@ -214,61 +773,35 @@ class SegTreeIter:
             i >>= 1
 
 
-class LazySegTreeIter:
+class SegTreeIterNumpy(SegTreeIter): 
+    """Iterative segment tree for range sum query backed by a NumPy array
+    Each level of the tree is built with one vectorized sum and batches of 
+    point updates only recompute the touched ancestors, level by level."""
 
-    def __init__(self, arr: List[int]): 
+    def __init__(self, arr: List[int], dtype: Any = "int64"): 
+        """Initialize the segment tree in O(log n) vectorized passes."""
+        if np is None: raise ImportError("SegTreeIterNumpy requires numpy")
         self.n = n = len(arr)
-        self.ht = n.bit_length()
-        self.tree = [0] * (2*n)
-        self.lazy = [0] * n
-
-    def _apply(self, p: int, val: int) -> None: 
-        self.tree[p] += val 
-        if p < self.n: self.lazy[p] += val
-
-    def _build(self, p: int) -> None: 
-        while p > 1: 
-            p >>= 1
-            self.tree[p] = max(self.tree[p<<1], self.tree[p<<1|1]) + self.lazy[p]
-
-    def _push(self, p: int) -> None: 
-        for s in range(self.ht, 0, -1): 
-            i = p >> s
-            if self.lazy[i]: 
-                self._apply(i<<1, self.lazy[i])
-                self._apply(i<<1|1, self.lazy[i])
-                self.lazy[i] = 0
+        self.tree = tree = np.zeros(2*n, dtype=dtype)
+        tree[n:] = arr
+        hi = n
+        while hi > 1: # nodes [lo, hi) only have children in [hi, 2*hi)
+            lo = hi + 1 >> 1
+            tree[lo:hi] = tree[2*lo:2*hi:2] + tree[2*lo+1:2*hi:2]
+            hi = lo
 
     def query(self, lo: int, hi: int) -> int: 
-        """Range query max from lo (inclusive) and hi (exclusive)
-        (Alternatively, one could range query max or min from lo to hi)."""
-        ans = -inf 
-        lo += self.n 
-        hi += self.n
-        self._push(lo)
-        self._push(hi-1)
-        while lo < hi: 
-            if lo & 1: 
-                ans = max(ans, self.tree[lo])
-                lo += 1
-            if hi & 1: 
-                hi -= 1
-                ans = max(ans, self.tree[hi])
-            lo >>= 1
-            hi >>= 1
-        return ans 
-
-    def update(self, lo: int, hi: int, val: int) -> None: 
-        lo += self.n
-        hi += self.n
-        ll = lo 
-        hh = hi 
-        while lo < hi: 
-            if lo & 1: 
-                lo += 1
-                self._apply(lo, val) 
-            if hi & 1: 
-                hi -= 1
-                self._apply(hi, val) 
-        self._build(ll)
-        self._build(hh - 1)
+        """Range query sum from lo (inclusive) and hi (exclusive)."""
+        return super().query(lo, hi).item() if lo < hi else 0
+
+    def update_many(self, indices: List[int], deltas: List[int]) -> None: 
+        """Point increment update the values at indices by deltas in a batch."""
+        tree = self.tree
+        k = np.asarray(indices, dtype=np.int64) + self.n
+        np.add.at(tree, k, deltas) # repeated indices accumulate 
+        k = np.unique(k >> 1)
+        k = k[k > 0]
+        while k.size: 
+            tree[k] = tree[2*k] + tree[2*k+1]
+            k = np.unique(k >> 1)
+            k = k[k > 0]
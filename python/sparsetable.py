@@ -0,0 +1,138 @@
+"""
+NAME
+    sparsetable - sparse table data structure
+
+DESCRIPTION
+    This module implements sparse tables for O(1) range query over a static
+    array after O(n log n) preprocessing.
+
+    * SparseTable          sparse table for idempotent op (min, max, gcd, ...)
+    * DisjointSparseTable  disjoint sparse table for any associative op
+                           (sum, product mod p, ...)
+
+    Each level is stored as a flat array. If vop (a vectorized version of op
+    acting elementwise on NumPy arrays, e.g. np.minimum, np.gcd or
+    lambda x, y: x*y % p) is given and NumPy is available, the levels are rows
+    of a NumPy matrix instead and both build and query_many are vectorized.
+    DisjointSparseTable builds its levels with vop.accumulate, so there vop
+    must be a NumPy ufunc (np.add, np.multiply, np.gcd, ...); any other vop
+    falls back to the array path.
+
+CLASSES
+    SparseTable(arr, op=min, vop=None, typecode="q")
+     |  Return a sparse table.
+     |
+     |  Methods defined here:
+     |
+     |      query(lo, hi)
+     |
+     |      query_many(los, his)
+
+    DisjointSparseTable(arr, op=add, vop=None, typecode="q")
+     |  Return a disjoint sparse table.
+     |
+     |  Methods defined here:
+     |
+     |      query(lo, hi)
+     |
+     |      query_many(los, his)
+"""
+
+from array import array
+from operator import add
+from typing import Callable, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _bit_length(x):
+    """Return the bit length of every (positive) integer in NumPy array x."""
+    return np.frexp(x.astype(np.float64))[1]
+
+
+class SparseTable:
+    """Sparse table for idempotent range query
+    Level j holds op over arr[i:i+2^j] so that any range is covered by two
+    overlapping blocks."""
+
+    def __init__(self, arr: List[int], op: Callable = min, vop: Callable = None, typecode: str = "q"):
+        """Build the table in O(n log n)."""
+        self.n = n = len(arr)
+        self.op = op
+        self.vop = vop if np is not None else None
+        if self.vop:
+            self.table = table = np.empty((max(1, n.bit_length()), n), dtype=np.asarray(arr).dtype)
+            table[0] = arr
+            for j in range(1, len(table)):
+                h = 1 << j-1
+                table[j, :n-2*h+1] = self.vop(table[j-1, :n-2*h+1], table[j-1, h:n-h+1])
+        else:
+            self.table = table = [array(typecode, arr)]
+            for j in range(1, n.bit_length()):
+                prev = table[-1]
+                h = 1 << j-1
+                table.append(array(typecode, map(op, prev[:len(prev)-h], prev[h:])))
+
+    def query(self, lo: int, hi: int) -> int:
+        """Query value from lo (inclusive) and hi (exclusive)."""
+        j = (hi - lo).bit_length() - 1
+        row = self.table[j]
+        return self.op(row[lo], row[hi - (1 << j)])
+
+    def query_many(self, los: List[int], his: List[int]) -> List[int]:
+        """Answer a batch of queries [los[i], his[i]) in one vectorized pass."""
+        if not self.vop: return [self.query(lo, hi) for lo, hi in zip(los, his)]
+        los, his = np.asarray(los, dtype=np.int64), np.asarray(his, dtype=np.int64)
+        j = _bit_length(his - los) - 1
+        return self.vop(self.table[j, los], self.table[j, his - (1 << j)])
+
+
+class DisjointSparseTable:
+    """Disjoint sparse table for associative range query
+    At level k the array is cut at every odd multiple m of 2^k; row k holds
+    op(arr[i:m]) for i in [m-2^k, m) and op(arr[m:i+1]) for i in [m, m+2^k),
+    so any range is the combination of exactly two precomputed values."""
+
+    def __init__(self, arr: List[int], op: Callable = add, vop: Callable = None, typecode: str = "q"):
+        """Build the table in O(n log n)."""
+        self.n = n = len(arr)
+        self.op = op
+        self.vop = vop if np is not None and isinstance(vop, np.ufunc) else None
+        levels = max(1, (n-1).bit_length())
+        if self.vop:
+            self.table = table = np.empty((levels, n), dtype=np.asarray(arr).dtype)
+            table[0] = arr
+            base = np.pad(table[0], (0, (1 << levels) - n), mode="edge") if n else table[0]
+            for k in range(1, levels):
+                blocks = base.reshape(-1, 1 << k)
+                row = np.empty_like(blocks)
+                # suffix scans over left halves, prefix scans over right halves
+                row[0::2] = self.vop.accumulate(blocks[0::2, ::-1], axis=1)[:, ::-1]
+                row[1::2] = self.vop.accumulate(blocks[1::2], axis=1)
+                table[k] = row.reshape(-1)[:n]
+        else:
+            self.table = table = [array(typecode, arr)]
+            for k in range(1, levels):
+                half = 1 << k
+                row = array(typecode, arr)
+                for m in range(half, n, 2*half):
+                    for i in range(m-2, m-half-1, -1): row[i] = op(arr[i], row[i+1])
+                    for i in range(m+1, min(m+half, n)): row[i] = op(row[i-1], arr[i])
+                table.append(row)
+
+    def query(self, lo: int, hi: int) -> int:
+        """Query value from lo (inclusive) and hi (exclusive)."""
+        hi -= 1
+        if lo == hi: return self.table[0][lo]
+        row = self.table[(lo ^ hi).bit_length() - 1]
+        return self.op(row[lo], row[hi])
+
+    def query_many(self, los: List[int], his: List[int]) -> List[int]:
+        """Answer a batch of queries [los[i], his[i]) in one vectorized pass."""
+        if not self.vop: return [self.query(lo, hi) for lo, hi in zip(los, his)]
+        los, his = np.asarray(los, dtype=np.int64), np.asarray(his, dtype=np.int64) - 1
+        k = np.maximum(_bit_length(los ^ his) - 1, 0)
+        return np.where(los == his, self.table[0, los], self.vop(self.table[k, los], self.table[k, his]))
@@ -4,11 +4,16 @@ NAME
 
 DESCRIPTION 
     This module implements union-find data structure including 
-        1) find with path compression 
-        2) union with rank. 
+        1) find with path compression (path halving for UnionFind)
+        2) union with rank (size). 
 
-    * UnionFind      union-find via array implementation
-    * UnionFindDict  union-find via dictionary implementation
+    * UnionFind             union-find via array implementation
+    * UnionFindDict         union-find via dictionary implementation
+    * UnionFindRollback     union-find with snapshot/rollback
+    * UnionFindWeighted     union-find keeping potentials relative to roots
+    * dynamic_connectivity  offline connectivity under edge insertion/deletion
+    * connected_components  vectorized bulk labeling from NumPy edge arrays
+    * parallel_components   multi-process labeling over sharded edge lists
 
 CLASSES
     class UnionFind(n)
@@ -21,6 +26,15 @@ CLASSES
      | 
      |  union(p, q) 
      |      connect p and q into one component 
+     | 
+     |  size(p) 
+     |      return the size of the component containing p 
+     | 
+     |  groups() 
+     |      return the members of every component 
+     | 
+     |  components 
+     |      number of components 
 
     class UnionFindDict()
      |  Return a union-find data structure 
@@ -32,30 +46,98 @@ CLASSES
      | 
      |  union(p, q)  
      |      connect p and q into one component
+
+    class UnionFindRollback(n)
+     |  Return a union-find data structure supporting rollback 
+     |  
+     |  Methods defined here: 
+     | 
+     |  find(p) 
+     |      find the root of p 
+     | 
+     |  union(p, q)  
+     |      connect p and q into one component
+     | 
+     |  snapshot()  
+     |      return a handle of the current state
+     | 
+     |  rollback(snapshot)  
+     |      undo every union made after snapshot
+
+    class UnionFindWeighted(n, op=add, inv=neg, e=0)
+     |  Return a union-find data structure with potentials 
+     |  
+     |  Methods defined here: 
+     | 
+     |  find(p) 
+     |      find the root of p 
+     | 
+     |  union(u, v, w)  
+     |      add constraint x_u - x_v = w (False on contradiction)
+     | 
+     |  diff(u, v)  
+     |      return x_u - x_v if known
+
+FUNCTIONS
+    dynamic_connectivity(n, ops)
+        Answer connectivity queries offline under edge insertion/deletion.
+
+    connected_components(n, src, dst=None)
+        Label connected components from (chunked) NumPy edge arrays.
+
+    parallel_components(n, src, dst, workers=None)
+        Label connected components with a process pool over edge shards 
+        (returned as array('i')).
 """
 
+import os
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from operator import add, neg
+from typing import Any, Callable, List, Tuple
+
+try: 
+    import numpy as np
+except ImportError: 
+    np = None
+
 class UnionFind:
     """Union-Find via array implementation"""
 
     def __init__(self, n: int):
-        self.parent = list(range(n))
-        self.rank = [1] * n
+        self.parent = array("i", range(n))
+        self.rank = array("i", [1]) * n # size of component (valid at roots)
+        self.components = n 
 
     def find(self, p: int) -> int:
-        """Find with path compression"""
-        if p != self.parent[p]:
-            self.parent[p] = self.find(self.parent[p])
-        return self.parent[p]
+        """Find with path halving"""
+        parent = self.parent
+        while p != parent[p]:
+            parent[p] = p = parent[parent[p]]
+        return p
 
     def union(self, p: int, q: int) -> bool:
-        """Union with rank"""
+        """Union by size"""
         prt, qrt = self.find(p), self.find(q)
         if prt == qrt: return False
         if self.rank[prt] > self.rank[qrt]: prt, qrt = qrt, prt 
         self.parent[prt] = qrt
         self.rank[qrt] += self.rank[prt]
+        self.components -= 1
         return True
 
+    def size(self, p: int) -> int: 
+        """Return the size of the component containing p"""
+        return self.rank[self.find(p)]
+
+    def groups(self) -> List[List[int]]: 
+        """Return the members of every component"""
+        ans = defaultdict(list)
+        for p in range(len(self.parent)): ans[self.find(p)].append(p)
+        return list(ans.values())
+
 
 class UnionFindDict:
     """Union-Find via dictionary implementation"""
@@ -79,3 +161,234 @@ class UnionFindDict:
         self.parent[prt] = qrt
         self.rank[qrt] += self.rank[prt]
         return True 
+
+
+class UnionFindRollback:
+    """Union-Find with rollback
+    Union by size without path compression keeps every union a single pointer 
+    change, so that unions can be undone in reverse order."""
+
+    def __init__(self, n: int):
+        self.parent = array("i", range(n))
+        self.rank = array("i", [1]) * n # size of component (valid at roots)
+        self.components = n 
+        self.history = [] # roots attached by successful unions 
+
+    def find(self, p: int) -> int:
+        """Find without path compression in O(log n)"""
+        parent = self.parent
+        while p != parent[p]: p = parent[p]
+        return p
+
+    def union(self, p: int, q: int) -> bool:
+        """Union by size"""
+        prt, qrt = self.find(p), self.find(q)
+        if prt == qrt: return False
+        if self.rank[prt] > self.rank[qrt]: prt, qrt = qrt, prt 
+        self.parent[prt] = qrt
+        self.rank[qrt] += self.rank[prt]
+        self.components -= 1
+        self.history.append(prt)
+        return True
+
+    def snapshot(self) -> int: 
+        """Return a handle of the current state"""
+        return len(self.history)
+
+    def rollback(self, snapshot: int) -> None: 
+        """Undo every union made after snapshot"""
+        while len(self.history) > snapshot: 
+            prt = self.history.pop()
+            qrt = self.parent[prt]
+            self.rank[qrt] -= self.rank[prt]
+            self.parent[prt] = prt
+            self.components += 1
+
+
+class UnionFindWeighted:
+    """Weighted (potential) Union-Find
+    Keep x_p - x_root for every node p over an abelian group (op, inv, e), 
+    e.g. offsets with (add, neg, 0) or ratios with (mul, lambda x: 1/x, 1) 
+    using Fraction, where x_u - x_v reads op(x_u, inv(x_v))."""
+
+    def __init__(self, n: int, op: Callable = add, inv: Callable = neg, e: Any = 0):
+        self.parent = array("i", range(n))
+        self.rank = array("i", [1]) * n # size of component (valid at roots)
+        self.pot = [e] * n              # x_p - x_parent[p] 
+        self.op = op 
+        self.inv = inv 
+
+    def find(self, p: int) -> int:
+        """Find with path compression (iterative, potentials rebased to root)"""
+        parent, pot, op = self.parent, self.pot, self.op
+        path = []
+        while p != parent[p]: 
+            path.append(p)
+            p = parent[p]
+        for q in reversed(path): # closest to root first 
+            if parent[q] != p: 
+                pot[q] = op(pot[q], pot[parent[q]])
+                parent[q] = p
+        return p
+
+    def union(self, u: int, v: int, w: Any) -> bool:
+        """Union by size with constraint x_u - x_v = w 
+        Return False if it contradicts the known constraints."""
+        op, inv, pot = self.op, self.inv, self.pot
+        urt, vrt = self.find(u), self.find(v)
+        if urt == vrt: return op(pot[u], inv(pot[v])) == w 
+        w = op(op(w, pot[v]), inv(pot[u])) # x_urt - x_vrt 
+        if self.rank[urt] > self.rank[vrt]: urt, vrt, w = vrt, urt, inv(w)
+        self.parent[urt] = vrt
+        self.pot[urt] = w
+        self.rank[vrt] += self.rank[urt]
+        return True
+
+    def diff(self, u: int, v: int) -> Any:
+        """Return x_u - x_v or None if u and v are not connected"""
+        if self.find(u) != self.find(v): return None 
+        return self.op(self.pot[u], self.inv(self.pot[v]))
+
+
+def dynamic_connectivity(n: int, ops: List[Tuple[str, int, int]]) -> List[bool]: 
+    """Offline dynamic connectivity via divide and conquer over time
+    ops is a list of ("add", u, v), ("remove", u, v) or ("query", u, v); return 
+    for every query whether u and v are connected at that time. Each edge lives 
+    on O(log T) nodes of a segment tree over time, which is traversed with a 
+    rollback union-find for O(log T log n) per edge."""
+    size = 1 << max(0, len(ops)-1).bit_length()
+    edges = [[] for _ in range(2*size)] # edges alive over the whole node range
+    alive = defaultdict(list)           # edge -> start times of live copies 
+
+    def insert(lo, hi, edge):
+        """Attach edge to the nodes covering times [lo, hi)."""
+        lo += size 
+        hi += size 
+        while lo < hi: 
+            if lo & 1: 
+                edges[lo].append(edge)
+                lo += 1
+            if hi & 1: 
+                hi -= 1
+                edges[hi].append(edge)
+            lo >>= 1
+            hi >>= 1
+
+    for t, (op, u, v) in enumerate(ops): 
+        edge = (u, v) if u < v else (v, u)
+        if op == "add": alive[edge].append(t)
+        elif op == "remove": insert(alive[edge].pop(), t, edge)
+    for edge, starts in alive.items(): 
+        for t in starts: insert(t, len(ops), edge)
+
+    ans = []
+    uf = UnionFindRollback(n)
+    stack = [(1, -1)]
+    while stack: 
+        k, snapshot = stack.pop()
+        if snapshot >= 0: uf.rollback(snapshot) # leaving node k 
+        elif k - size < len(ops): 
+            stack.append((k, uf.snapshot()))
+            for u, v in edges[k]: uf.union(u, v)
+            if k >= size: 
+                op, u, v = ops[k - size]
+                if op == "query": ans.append(uf.find(u) == uf.find(v))
+            else: 
+                stack.append((2*k+1, -1))
+                stack.append((2*k, -1))
+    return ans 
+
+
+def connected_components(n: int, src: Any, dst: Any = None) -> "np.ndarray": 
+    """Shiloach-Vishkin style connected components over NumPy edge arrays
+    Return label where label[p] is the smallest node connected to p. Edges are 
+    given as arrays src, dst or, with dst omitted, as an iterable of (src, dst) 
+    chunks which are folded into the labels one at a time. Every round hooks 
+    the larger root of each unsettled edge onto the smaller one and then jumps 
+    pointers until every node points to a root again."""
+    if np is None: raise ImportError("connected_components requires numpy")
+    label = np.arange(n, dtype=np.int64)
+    for s, d in [(src, dst)] if dst is not None else src: 
+        s, d = np.asarray(s, dtype=np.int64), np.asarray(d, dtype=np.int64)
+        while True: 
+            ls, ld = label[s], label[d]
+            mask = ls != ld
+            if not mask.any(): break 
+            s, d, ls, ld = s[mask], d[mask], ls[mask], ld[mask] # drop settled edges 
+            np.minimum.at(label, np.maximum(ls, ld), np.minimum(ls, ld)) # hooking 
+            while True: # pointer jumping 
+                nxt = label[label]
+                if np.array_equal(nxt, label): break 
+                label = nxt
+    return label 
+
+
+def _shard_components(edges_name: str, m: int, lo: int, hi: int, parents_name: str, n: int, slot: int) -> None: 
+    """Union edges[lo:hi] in a local UnionFind and store the root of every node 
+    in parents[slot] (runs in a worker process)."""
+    edges_shm = shared_memory.SharedMemory(name=edges_name)
+    parents_shm = shared_memory.SharedMemory(name=parents_name)
+    try: 
+        edges = edges_shm.buf[:16*m].cast("q")
+        uf = UnionFind(n)
+        for u, v in zip(edges[lo:hi], edges[m+lo:m+hi]): uf.union(u, v)
+        del edges 
+        parents = parents_shm.buf[slot*4*n:(slot+1)*4*n].cast("i")
+        parents[:] = array("i", map(uf.find, range(n)))
+        del parents 
+    finally: 
+        edges_shm.close()
+        parents_shm.close()
+
+
+def _merge_shards(parents_name: str, n: int, a: int, b: int) -> None: 
+    """Merge forest parents[b] into parents[a] by unioning its (node, root) 
+    pairs (runs in a worker process)."""
+    parents_shm = shared_memory.SharedMemory(name=parents_name)
+    try: 
+        parents = parents_shm.buf[:4*n*max(a, b)+4*n].cast("i")
+        uf = UnionFind(n)
+        uf.parent = array("i", parents[a*n:(a+1)*n]) # a star forest is a valid state 
+        uf.rank = array("i", bytes(4*n))
+        for p in uf.parent: uf.rank[p] += 1
+        for p, q in enumerate(parents[b*n:(b+1)*n]): 
+            if p != q: uf.union(p, q)
+        parents[a*n:(a+1)*n] = array("i", map(uf.find, range(n)))
+        del parents 
+    finally: 
+        parents_shm.close()
+
+
+def parallel_components(n: int, src: Any, dst: Any, workers: int = None) -> array: 
+    """Connected components over partitioned edge streams in parallel
+    Return label as an array('i') where label[p] is the root of the component 
+    containing p. Edges are sharded across a process pool, each shard builds a local UnionFind 
+    and the shard forests are merged pairwise in a reduction tree. Edges and 
+    parent arrays cross processes via shared memory instead of pickling."""
+    workers = workers or os.cpu_count() or 1
+    m = len(src)
+    edges_shm = shared_memory.SharedMemory(create=True, size=max(16, 16*m))
+    parents_shm = shared_memory.SharedMemory(create=True, size=max(4, 4*n*workers))
+    try: 
+        for i, seq in enumerate((src, dst)): 
+            data = memoryview(np.ascontiguousarray(seq, dtype=np.int64) if np is not None else array("q", seq))
+            edges_shm.buf[8*m*i:8*m*(i+1)] = data.cast("B")
+            del data 
+        with ProcessPoolExecutor(workers) as pool: 
+            bounds = [m*i//workers for i in range(workers+1)]
+            for f in [pool.submit(_shard_components, edges_shm.name, m, bounds[i], bounds[i+1], parents_shm.name, n, i) 
+                      for i in range(workers)]: f.result()
+            step = 1
+            while step < workers: 
+                for f in [pool.submit(_merge_shards, parents_shm.name, n, a, a+step) 
+                          for a in range(0, workers-step, 2*step)]: f.result()
+                step *= 2
+        parents = parents_shm.buf[:4*n].cast("i")
+        ans = array("i", parents)
+        del parents 
+        return ans 
+    finally: 
+        edges_shm.close()
+        edges_shm.unlink()
+        parents_shm.close()
+        parents_shm.unlink()
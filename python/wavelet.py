@@ -0,0 +1,176 @@
+"""
+NAME
+    wavelet - wavelet matrix and merge sort tree
+
+DESCRIPTION
+    This module implements static structures answering order statistics over
+    a subarray a[lo:hi] without sorting it.
+
+    * WaveletMatrix  wavelet matrix with O(log σ) kth/rank/frequency query
+    * MergeSortTree  merge sort tree with fractional cascading
+
+    Values are compressed to their ranks among the distinct values, so σ is
+    the number of distinct values and any comparable values are allowed.
+
+CLASSES
+    WaveletMatrix(arr)
+     |  Return a wavelet matrix.
+     |
+     |  Methods defined here:
+     |
+     |      access(i)
+     |
+     |      kth_smallest(lo, hi, k)
+     |
+     |      rank(lo, hi, x)
+     |
+     |      range_freq(lo, hi, xlo, xhi)
+
+    MergeSortTree(arr)
+     |  Return a merge sort tree.
+     |
+     |  Methods defined here:
+     |
+     |      kth_smallest(lo, hi, k)
+     |
+     |      rank(lo, hi, x)
+     |
+     |      range_freq(lo, hi, xlo, xhi)
+"""
+
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Any, List
+
+
+class WaveletMatrix:
+    """Wavelet matrix
+    Level b (from the most significant bit down) stores the bth bit of every
+    value as a bytearray plus a rank directory zeros[b][i] = count of 0 bits in
+    the first i positions, then stably moves 0s before 1s for the next level."""
+
+    def __init__(self, arr: List[Any]):
+        self.n = len(arr)
+        self.vals = vals = sorted(set(arr))
+        rank = {x: i for i, x in enumerate(vals)}
+        self.log = log = max(1, (len(vals)-1).bit_length())
+        self.bits = []  # bits[lv][i] bit of ith value at level lv
+        self.zeros = [] # zeros[lv][i] count of 0 bits in bits[lv][:i]
+        self.nz = []    # nz[lv] total count of 0 bits at level lv
+        cur = [rank[x] for x in arr]
+        for b in range(log-1, -1, -1):
+            bits = bytearray(x >> b & 1 for x in cur)
+            zeros = array("i", accumulate((1 - x for x in bits), initial=0))
+            self.bits.append(bits)
+            self.zeros.append(zeros)
+            self.nz.append(zeros[-1])
+            cur = [x for x in cur if not x >> b & 1] + [x for x in cur if x >> b & 1]
+
+    def access(self, i: int) -> Any:
+        """Return the value at i."""
+        ans = 0
+        for bits, zeros, nz in zip(self.bits, self.zeros, self.nz):
+            ans <<= 1
+            if bits[i]:
+                ans |= 1
+                i = nz + i - zeros[i]
+            else: i = zeros[i]
+        return self.vals[ans]
+
+    def kth_smallest(self, lo: int, hi: int, k: int) -> Any:
+        """Return the kth (0-indexed) smallest value from lo (inclusive) and hi (exclusive)."""
+        ans = 0
+        for zeros, nz in zip(self.zeros, self.nz):
+            zlo, zhi = zeros[lo], zeros[hi]
+            ans <<= 1
+            if k < zhi - zlo: lo, hi = zlo, zhi
+            else:
+                k -= zhi - zlo
+                ans |= 1
+                lo, hi = nz + lo - zlo, nz + hi - zhi
+        return self.vals[ans]
+
+    def _count_less(self, lo: int, hi: int, c: int) -> int:
+        """Return count of compressed values less than c from lo (inclusive) and hi (exclusive)."""
+        if c >= 1 << self.log: return hi - lo
+        ans = 0
+        b = self.log
+        for zeros, nz in zip(self.zeros, self.nz):
+            b -= 1
+            zlo, zhi = zeros[lo], zeros[hi]
+            if c >> b & 1:
+                ans += zhi - zlo
+                lo, hi = nz + lo - zlo, nz + hi - zhi
+            else: lo, hi = zlo, zhi
+        return ans
+
+    def rank(self, lo: int, hi: int, x: Any) -> int:
+        """Return count of values less than x from lo (inclusive) and hi (exclusive)."""
+        return self._count_less(lo, hi, bisect_left(self.vals, x))
+
+    def range_freq(self, lo: int, hi: int, xlo: Any, xhi: Any) -> int:
+        """Return count of values in [xlo, xhi) from lo (inclusive) and hi (exclusive)."""
+        return self.rank(lo, hi, xhi) - self.rank(lo, hi, xlo)
+
+
+class MergeSortTree:
+    """Merge sort tree with fractional cascading
+    Node k keeps the sorted (compressed) values of its range together with
+    lcnt[k][j] = count of the first j of them coming from the left child, so a
+    single binary search at the root locates x in every node on the way down."""
+
+    def __init__(self, arr: List[Any]):
+        self.n = n = len(arr)
+        self.vals = vals = sorted(set(arr))
+        rank = {x: i for i, x in enumerate(vals)}
+        self.size = size = 1 << max(0, n-1).bit_length()
+        self.tree = tree = [array("i") for _ in range(2*size)]
+        self.lcnt = lcnt = [None] * size
+        for i, x in enumerate(arr): tree[size+i].append(rank[x])
+        for k in range(size-1, 0, -1):
+            left, right = tree[2*k], tree[2*k+1]
+            merged, cnt = tree[k], array("i", [0])
+            i = j = 0
+            while i < len(left) or j < len(right):
+                if j == len(right) or i < len(left) and left[i] <= right[j]:
+                    merged.append(left[i])
+                    i += 1
+                else:
+                    merged.append(right[j])
+                    j += 1
+                cnt.append(i)
+            lcnt[k] = cnt
+
+    def _count_less(self, lo: int, hi: int, c: int) -> int:
+        """Return count of compressed values less than c from lo (inclusive) and hi (exclusive)."""
+        ans = 0
+        stack = [(1, 0, self.size, bisect_left(self.tree[1], c))]
+        while stack:
+            k, l, r, p = stack.pop()
+            if hi <= l or r <= lo or not p: continue   #      no overlap
+            if lo <= l and r <= hi: ans += p           #   total overlap
+            else:                                      # partial overlap
+                mid = l + r >> 1
+                q = self.lcnt[k][p]
+                stack.append((2*k, l, mid, q))
+                stack.append((2*k+1, mid, r, p - q))
+        return ans
+
+    def rank(self, lo: int, hi: int, x: Any) -> int:
+        """Return count of values less than x from lo (inclusive) and hi (exclusive)."""
+        return self._count_less(lo, hi, bisect_left(self.vals, x))
+
+    def range_freq(self, lo: int, hi: int, xlo: Any, xhi: Any) -> int:
+        """Return count of values in [xlo, xhi) from lo (inclusive) and hi (exclusive)."""
+        return self.rank(lo, hi, xhi) - self.rank(lo, hi, xlo)
+
+    def kth_smallest(self, lo: int, hi: int, k: int) -> Any:
+        """Return the kth (0-indexed) smallest value from lo (inclusive) and hi (exclusive)
+        via binary search over values in O(log σ log n)."""
+        clo, chi = 0, len(self.vals)-1
+        while clo < chi:
+            mid = clo + chi >> 1
+            if self._count_less(lo, hi, mid+1) > k: chi = mid
+            else: clo = mid + 1
+        return self.vals[clo]